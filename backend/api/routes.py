@@ -1,19 +1,30 @@
 """
 API routes for the LoadTest application.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pymongo.database import Database
+from pymongo.errors import ExecutionTimeout
 from bson import ObjectId
+from celery import states as celery_states
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+import ipaddress
 import redis
 
-from database import get_db
-from redis_client import get_redis
+from config import settings
+from database import get_db, mongodb
+from redis_client import get_redis, get_pool_stats
+from tasks import get_celery_app, get_task_map
+from rate_limit import admission_controller
+from query_guard import query_guard
+from memoize import task_memo
+from tracing import tracer
+from task_telemetry import task_telemetry
 from models import (
-    DataEntry, DataEntryCreate, DataEntryUpdate,
+    DataEntry, DataEntryCreate, DataEntryUpdate, DataEntryStatus, DataEntryFilter,
+    DataEntryBulkSelection, DataEntryBulkUpdate, DataEntryBulkDelete, BulkOperationResult,
     TaskCreate, TaskResponse, TaskStatus,
-    HealthCheck, Metrics
+    HealthCheck, Metrics, ConnectionPoolMetrics, TaskResourceStats
 )
 
 router = APIRouter(prefix="/api")
@@ -39,6 +50,77 @@ def get_object_id(id_str: str) -> ObjectId:
         )
 
 
+def is_trusted_proxy(host: str) -> bool:
+    """Whether host is one of the configured rate_limit_trusted_proxies."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(proxy.strip(), strict=False)
+        for proxy in settings.rate_limit_trusted_proxies.split(",") if proxy.strip()
+    )
+
+
+def get_client_id(request: Request) -> str:
+    """
+    Identify the caller for rate limiting.
+    
+    Keyed on the peer address. Identity headers are only honoured on
+    requests relayed by a trusted proxy: its X-Client-ID, else the nearest
+    X-Forwarded-For hop that is not itself a trusted proxy.
+    """
+    host = request.client.host if request.client else "unknown"
+    if not is_trusted_proxy(host):
+        return host
+    client_id = request.headers.get("x-client-id")
+    if client_id:
+        return client_id
+    forwarded_for = request.headers.get("x-forwarded-for", "")
+    for hop in reversed(forwarded_for.split(",")):
+        hop = hop.strip()
+        if hop and not is_trusted_proxy(hop):
+            return hop
+    return host
+
+
+def get_bulk_query(selection: DataEntryBulkSelection) -> dict:
+    """Build the MongoDB query for a bulk id list or filter."""
+    if selection.ids is None:
+        return selection.filter.to_query()
+    if len(selection.ids) > settings.bulk_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_max_ids} ids per request"
+        )
+    return {"_id": {"$in": [get_object_id(id_str) for id_str in selection.ids]}}
+
+
+def exceeds_sync_limit(db: Database, selection: DataEntryBulkSelection, query: dict) -> bool:
+    """Whether a filter matches too many entries to process within the request."""
+    if selection.filter is None:
+        return False
+    matched = db["data_entries"].count_documents(query, limit=settings.bulk_sync_limit + 1)
+    return matched > settings.bulk_sync_limit
+
+
+def queue_bulk_job(db: Database, response: Response, task_type: str, kwargs: dict) -> dict:
+    """Run a bulk operation as a Celery job; progress is available via /api/tasks/{id}."""
+    result = get_celery_app().send_task(f"tasks.{task_type}", kwargs=kwargs)
+    db["tasks"].insert_one({
+        "task_id": result.id,
+        "task_type": task_type,
+        "status": TaskStatus.PENDING,
+        "params": kwargs,
+        "ignore_result": False,
+        "created_at": datetime.utcnow(),
+        "result": None,
+        "error": None
+    })
+    response.status_code = status.HTTP_202_ACCEPTED
+    return {"matched": settings.bulk_sync_limit + 1, "task_id": result.id}
+
+
 # Health Check Endpoint
 
 @router.get("/health", response_model=HealthCheck)
@@ -75,8 +157,7 @@ async def health_check(
     # Check Celery (via Redis)
     try:
         # Check if there are any workers
-        from celery_app import celery_app
-        inspect = celery_app.control.inspect()
+        inspect = get_celery_app().control.inspect()
         active_workers = inspect.active()
         if active_workers:
             health["celery"] = f"connected ({len(active_workers)} workers)"
@@ -115,35 +196,129 @@ async def get_metrics(
     }
 
 
+@router.get("/metrics/pools", response_model=ConnectionPoolMetrics)
+async def get_pool_metrics():
+    """
+    Get connection pool utilization and wait times for this process.
+    """
+    return {
+        "mongodb": mongodb.pool_stats(),
+        "redis": get_pool_stats()
+    }
+
+
+@router.get("/metrics/tasks", response_model=dict[str, TaskResourceStats])
+async def get_task_resource_metrics(
+    redis_client: redis.Redis = Depends(get_redis)
+):
+    """
+    Get CPU, wall time, memory and allocation statistics per task type,
+    aggregated across all workers.
+    """
+    return task_telemetry.read(redis_client)
+
+
 # Task Endpoints
 
+def task_status_from_state(state: str) -> TaskStatus:
+    """
+    TaskStatus for a Celery state. Revoked and rejected tasks map to
+    failure, other states without a counterpart (RECEIVED, custom states)
+    to pending.
+    """
+    try:
+        return TaskStatus(state.lower())
+    except ValueError:
+        if state in (celery_states.REVOKED, celery_states.REJECTED):
+            return TaskStatus.FAILURE
+        return TaskStatus.PENDING
+
+
+def memoized_response(
+    db: Database, response: Response, task_id: str, task_type: str, state: str = None
+) -> TaskResponse:
+    """Response for a submission attached to an existing execution."""
+    if state is None:
+        state = get_celery_app().AsyncResult(task_id).state
+    # The submission that reserved the execution may not have stored its
+    # metadata yet
+    task_doc = db["tasks"].find_one({"task_id": task_id}, {"created_at": 1})
+    response.status_code = status.HTTP_200_OK
+    return TaskResponse(
+        task_id=task_id,
+        status=task_status_from_state(state),
+        task_type=task_type,
+        created_at=task_doc["created_at"] if task_doc else datetime.utcnow(),
+        memoized=True
+    )
+
+
 @router.post("/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_data: TaskCreate,
-    db: Database = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: Database = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis)
 ):
     """
     Create and queue an async task.
+    
+    Returns 429 with Retry-After when the client or task type exceeds its
+    rate limit, or when the broker backlog is above the admission threshold.
+    
+    For memoized task types, a submission with the same params as a recent
+    or in-flight one returns 200 with that execution's task_id instead of
+    queueing a new run.
     """
-    from celery_app import celery_app
-    from tasks.celery_tasks import process_data, generate_report, simulate_load
-    
-    # Map task types to Celery tasks
-    task_map = {
-        "process_data": process_data,
-        "generate_report": generate_report,
-        "simulate_load": simulate_load
-    }
+    task_map = get_task_map(task_data.ignore_result)
     
     if task_data.task_type not in task_map:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unknown task type: {task_data.task_type}"
         )
+    celery_task = task_map[task_data.task_type]
+    
+    memo_key = None
+    if task_memo.enabled_for(celery_task, task_data.ignore_result):
+        memo_key = task_memo.key(celery_task, task_data.params)
+        task_id, state = task_memo.lookup(
+            redis_client, memo_key,
+            lambda task_id: get_celery_app().AsyncResult(task_id).state
+        )
+        if task_id:
+            return memoized_response(db, response, task_id, task_data.task_type, state)
+    
+    retry_after = admission_controller.check(
+        redis_client,
+        get_client_id(request),
+        task_data.task_type,
+        get_celery_app().conf.task_default_queue
+    )
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Task submission rate exceeded or queue is saturated",
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    task_id = None
+    if memo_key:
+        task_id, reserved = task_memo.reserve(redis_client, memo_key)
+        if not reserved:
+            return memoized_response(db, response, task_id, task_data.task_type)
     
     # Queue the task
-    celery_task = task_map[task_data.task_type]
-    result = celery_task.delay(**task_data.params)
+    try:
+        result = celery_task.apply_async(
+            kwargs=task_data.params,
+            task_id=task_id
+        )
+    except Exception:
+        if memo_key:
+            task_memo.release(redis_client, memo_key)
+        raise
     
     # Store task metadata in MongoDB
     task_doc = {
@@ -151,6 +326,7 @@ async def create_task(
         "task_type": task_data.task_type,
         "status": TaskStatus.PENDING,
         "params": task_data.params,
+        "ignore_result": task_data.ignore_result,
         "created_at": datetime.utcnow(),
         "result": None,
         "error": None
@@ -174,11 +350,8 @@ async def get_task_status(
     """
     Get the status and result of a task.
     """
-    from celery_app import celery_app
-    from celery.result import AsyncResult
-    
     # Get task result from Celery
-    result = AsyncResult(task_id, app=celery_app)
+    result = get_celery_app().AsyncResult(task_id)
     
     # Get task metadata from MongoDB
     task_doc = db["tasks"].find_one({"task_id": task_id})
@@ -190,20 +363,23 @@ async def get_task_status(
         )
     
     # Update status from Celery
-    task_status = TaskStatus(result.state.lower())
-    
-    response = TaskResponse(
-        task_id=task_id,
-        status=task_status,
-        task_type=task_doc["task_type"],
-        created_at=task_doc["created_at"]
-    )
-    
-    if result.ready():
-        if result.successful():
-            response.result = result.result
-        else:
-            response.error = str(result.info)
+    with tracer.span("celery.result", **{"celery.task_id": task_id}):
+        task_status = task_status_from_state(result.state)
+        
+        response = TaskResponse(
+            task_id=task_id,
+            status=task_status,
+            task_type=task_doc["task_type"],
+            created_at=task_doc["created_at"]
+        )
+        
+        if result.ready():
+            if result.successful():
+                response.result = result.result
+            else:
+                response.error = str(result.info)
+        elif task_status == TaskStatus.PROGRESS and isinstance(result.info, dict):
+            response.progress = result.info
     
     return response
 
@@ -212,17 +388,58 @@ async def get_task_status(
 
 @router.get("/data", response_model=List[DataEntry])
 async def list_data_entries(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0, le=settings.data_query_max_skip),
+    limit: int = Query(100, ge=1, le=settings.data_query_max_limit),
+    entry_status: Optional[DataEntryStatus] = Query(None, alias="status"),
+    value_min: Optional[float] = None,
+    value_max: Optional[float] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=100),
+    search: Optional[str] = Query(None, min_length=1, max_length=200),
     db: Database = Depends(get_db)
 ):
     """
-    List all data entries with pagination.
+    List data entries, newest first, with optional filters.
+    
+    search is a full-text search on name and description. Filters that no
+    single index serves in newest-first order are rejected with 503 and
+    Retry-After while the process is busy.
     """
     collection = db["data_entries"]
+    entry_filter = DataEntryFilter(
+        status=entry_status,
+        value_min=value_min,
+        value_max=value_max,
+        created_after=created_after,
+        created_before=created_before,
+        name_prefix=name_prefix,
+        search=search
+    )
     
-    cursor = collection.find().skip(skip).limit(limit).sort("created_at", -1)
-    entries = [serialize_doc(doc) for doc in cursor]
+    retry_after = query_guard.check(entry_filter)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unindexed query shape rejected under load; narrow the filter or retry later",
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    cursor = (
+        collection.find(entry_filter.to_query())
+        .skip(skip)
+        .limit(limit)
+        .sort("created_at", -1)
+        .max_time_ms(settings.data_query_max_time_ms)
+    )
+    try:
+        entries = [serialize_doc(doc) for doc in cursor]
+    except ExecutionTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Query exceeded its time limit",
+            headers={"Retry-After": str(settings.admission_retry_after)}
+        )
     
     return entries
 
@@ -250,6 +467,59 @@ async def create_data_entry(
     return doc
 
 
+@router.patch("/data", response_model=BulkOperationResult)
+async def bulk_update_data_entries(
+    bulk: DataEntryBulkUpdate,
+    response: Response,
+    db: Database = Depends(get_db)
+):
+    """
+    Update many data entries selected by ids or by filter.
+    
+    Filters matching more than bulk_sync_limit entries are applied by a
+    background job: the response is 202 with a task_id, and matched is a
+    lower bound.
+    """
+    update_data = bulk.update.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+    
+    query = get_bulk_query(bulk)
+    if exceeds_sync_limit(db, bulk, query):
+        return queue_bulk_job(db, response, "bulk_update_data_entries", {
+            "filter": bulk.filter.model_dump(mode="json"),
+            "update": bulk.update.model_dump(mode="json", exclude_unset=True)
+        })
+    
+    update_data["updated_at"] = datetime.utcnow()
+    result = db["data_entries"].update_many(query, {"$set": update_data})
+    return {"matched": result.matched_count, "modified": result.modified_count}
+
+
+@router.delete("/data", response_model=BulkOperationResult)
+async def bulk_delete_data_entries(
+    bulk: DataEntryBulkDelete,
+    response: Response,
+    db: Database = Depends(get_db)
+):
+    """
+    Delete many data entries selected by ids or by filter.
+    
+    Large filters run in the background as for PATCH /api/data.
+    """
+    query = get_bulk_query(bulk)
+    if exceeds_sync_limit(db, bulk, query):
+        return queue_bulk_job(db, response, "bulk_delete_data_entries", {
+            "filter": bulk.filter.model_dump(mode="json")
+        })
+    
+    result = db["data_entries"].delete_many(query)
+    return {"matched": result.deleted_count, "deleted": result.deleted_count}
+
+
 @router.get("/data/{entry_id}", response_model=DataEntry)
 async def get_data_entry(
     entry_id: str,
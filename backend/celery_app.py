@@ -1,27 +1,189 @@
 """
 Celery application configuration.
 """
-from celery import Celery
+from celery import Celery, signals
+from celery.backends.redis import RedisBackend
+from kombu import compression
 from config import settings
+from redis_client import get_connection_pool
+from logging_config import setup_logging, request_id_var, task_id_var
+from tracing import tracer, current_span_var, parse_traceparent
+import time
+
+
+# Prefix of compressed results, followed by the codec content type and ":".
+# A NUL byte never starts a JSON or msgpack payload, so values stored before
+# compression was enabled still decode.
+COMPRESSED_RESULT_PREFIX = b"\x00compressed:"
+
+
+class SharedPoolRedisBackend(RedisBackend):
+    """
+    Redis result backend whose connections come from the process-wide pool
+    registry, so they are bounded by the redis_* settings and reported at
+    /api/metrics/pools.
+    
+    Celery's Redis backend ignores result_compression, so results of at
+    least celery_result_compression_min_bytes are compressed here.
+    """
+    
+    def _get_pool(self, **params):
+        return get_connection_pool(self.url, decode_responses=False)
+    
+    def encode(self, data):
+        payload = super().encode(data)
+        codec = self.app.conf.result_compression
+        if not codec or len(payload) < settings.celery_result_compression_min_bytes:
+            return payload
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        body, content_type = compression.compress(payload, codec)
+        return COMPRESSED_RESULT_PREFIX + content_type.encode() + b":" + body
+    
+    def decode(self, payload):
+        if isinstance(payload, bytes) and payload.startswith(COMPRESSED_RESULT_PREFIX):
+            content_type, _, body = payload[len(COMPRESSED_RESULT_PREFIX):].partition(b":")
+            payload = compression.decompress(body, content_type.decode())
+        return super().decode(payload)
+
+
+def _result_backend_url(url: str) -> str:
+    """Route plain Redis result backends through SharedPoolRedisBackend."""
+    if url.startswith(("redis://", "rediss://")):
+        return f"{__name__}:SharedPoolRedisBackend+{url}"
+    return url
+
 
 # Create Celery app
 celery_app = Celery(
     "loadtest",
     broker=settings.celery_broker_url,
-    backend=settings.celery_result_backend,
-    include=["tasks.celery_tasks"]
+    backend=_result_backend_url(settings.celery_result_backend),
+    include=["tasks.celery_tasks", "tasks.maintenance", "tasks.bulk", "tasks.telemetry"]
 )
 
 # Configure Celery
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer=settings.celery_serializer,
+    # Keep accepting JSON so queued messages survive a serializer switch
+    accept_content=sorted({"json", settings.celery_serializer}),
+    result_serializer=settings.celery_serializer,
+    result_accept_content=sorted({"json", settings.celery_serializer}),
+    result_expires=settings.celery_result_expires,
+    task_compression=settings.celery_task_compression,
+    result_compression=settings.celery_result_compression,
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
     task_time_limit=300,  # 5 minutes
     task_soft_time_limit=270,  # 4.5 minutes
     worker_prefetch_multiplier=settings.worker_prefetch_multiplier,
-    worker_max_tasks_per_child=1000,
+    # Recycle pool processes by memory rather than after a fixed task count
+    worker_max_memory_per_child=settings.worker_max_memory_per_child_kb or None,
+    worker_max_tasks_per_child=settings.worker_max_tasks_per_child or None,
+    # Maintenance schedule; a missed run is dropped rather than queued twice
+    beat_schedule={
+        "archive-data-entries": {
+            "task": "tasks.archive_data_entries",
+            "schedule": settings.archive_interval_seconds,
+            "options": {"expires": settings.archive_interval_seconds},
+        },
+        "purge-finished-tasks": {
+            "task": "tasks.purge_finished_tasks",
+            "schedule": settings.task_purge_interval_seconds,
+            "options": {"expires": settings.task_purge_interval_seconds},
+        },
+    },
+    # Connection tuning
+    broker_pool_limit=settings.celery_broker_pool_limit,
+    broker_transport_options={
+        "max_connections": settings.redis_max_connections,
+        "socket_timeout": settings.redis_socket_timeout,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout,
+        "health_check_interval": settings.redis_health_check_interval,
+    },
 )
+
+
+# Logging: the structured queue pipeline replaces Celery's own setup, and
+# the request id of the submitting HTTP request travels in a message header
+
+@signals.setup_logging.connect
+def configure_logging(**kwargs):
+    setup_logging()
+
+
+@signals.worker_process_init.connect
+def restart_logging(**kwargs):
+    # Forked pool processes do not inherit the listener thread
+    setup_logging()
+
+
+@signals.worker_process_shutdown.connect
+def flush_spans(**kwargs):
+    tracer.flush()
+
+
+# Tracing: a publish span per sent task whose context travels in the
+# traceparent header, and on the worker a queue wait span (publish to
+# pickup) plus an execute span that is current while the task runs.
+# Spans are keyed by task id between the paired signals.
+_publish_spans = {}
+_execute_spans = {}
+
+
+@signals.before_task_publish.connect
+def add_context_headers(headers=None, **kwargs):
+    if headers is None:
+        return
+    request_id = request_id_var.get()
+    if request_id:
+        headers.setdefault("request_id", request_id)
+    if tracer.enabled:
+        span = tracer.start_span(
+            f"celery.publish {headers.get('task')}",
+            kind="producer",
+            attributes={"celery.task_id": headers.get("id"), "celery.task_name": headers.get("task")}
+        )
+        _publish_spans[headers.get("id")] = span
+        headers["traceparent"] = span.traceparent()
+        headers["published_at"] = time.time()
+
+
+@signals.after_task_publish.connect
+def end_publish_span(headers=None, **kwargs):
+    span = _publish_spans.pop(headers.get("id"), None) if headers else None
+    if span:
+        tracer.end_span(span)
+
+
+@signals.task_prerun.connect
+def bind_task_context(task_id=None, task=None, **kwargs):
+    request_id_var.set(getattr(task.request, "request_id", None))
+    task_id_var.set(task_id)
+    if not tracer.enabled:
+        return
+    
+    parent = parse_traceparent(getattr(task.request, "traceparent", None))
+    published_at = getattr(task.request, "published_at", None)
+    attributes = {"celery.task_id": task_id, "celery.task_name": task.name}
+    if published_at:
+        now_ns = time.time_ns()
+        queue_span = tracer.start_span(f"celery.queue {task.name}", parent=parent, attributes=dict(attributes))
+        queue_span.start_ns = int(published_at * 1e9)
+        tracer.end_span(queue_span, end_ns=now_ns)
+        attributes["celery.queue_wait_ms"] = round((now_ns - queue_span.start_ns) / 1e6, 3)
+    span = tracer.start_span(f"celery.execute {task.name}", kind="consumer", parent=parent, attributes=attributes)
+    _execute_spans[task_id] = (span, current_span_var.set(span))
+
+
+@signals.task_postrun.connect
+def clear_task_context(task_id=None, state=None, retval=None, **kwargs):
+    request_id_var.set(None)
+    task_id_var.set(None)
+    entry = _execute_spans.pop(task_id, None)
+    if entry:
+        span, token = entry
+        span.set_attribute("celery.state", state)
+        tracer.end_span(span, error=retval if state == "FAILURE" else None)
+        current_span_var.reset(token)
@@ -13,6 +13,17 @@ class Settings(BaseSettings):
     app_name: str = "LoadTest Demo"
     app_env: str = "development"
     log_level: str = "info"
+    log_format: str = "json"  # "json" or "text"
+    log_queue_size: int = 10000  # Records beyond this are dropped rather than blocking
+    log_access: bool = True
+    log_sample_paths: str = "/api/health"  # Comma-separated; successful requests are sampled
+    log_sample_rate: float = 0.01
+    
+    # Tracing (spans appended as JSON lines to trace_export_path)
+    tracing_enabled: bool = False
+    trace_sample_rate: float = 1.0  # Fraction of new traces recorded
+    trace_export_path: str = "traces.jsonl"
+    trace_queue_size: int = 10000
     
     # MongoDB
     mongodb_url: str = "mongodb://mongodb:27017"
@@ -20,19 +31,104 @@ class Settings(BaseSettings):
     mongodb_username: Optional[str] = None
     mongodb_password: Optional[str] = None
     
+    # MongoDB client tuning
+    # Pools are per process: size them as (uvicorn workers x max_pool_size)
+    # against the server's connection limit.
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 0
+    mongodb_max_idle_time_ms: Optional[int] = None
+    mongodb_wait_queue_timeout_ms: Optional[int] = None
+    mongodb_connect_timeout_ms: int = 20000
+    mongodb_socket_timeout_ms: Optional[int] = None
+    mongodb_server_selection_timeout_ms: int = 30000
+    mongodb_compressors: str = ""  # Comma-separated, e.g. "zstd,snappy,zlib"
+    mongodb_read_preference: str = "primary"
+    mongodb_write_concern: str = "1"  # Number of nodes or "majority"
+    
     # Redis
     redis_url: str = "redis://redis:6379/0"
     
+    # Redis client tuning (applied to the API and Celery result backend pools)
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 5.0  # Seconds to wait for a free connection
+    redis_socket_timeout: Optional[float] = 5.0
+    redis_socket_connect_timeout: Optional[float] = 5.0
+    redis_health_check_interval: int = 30
+    
     # Celery
     celery_broker_url: str = "redis://redis:6379/0"
     celery_result_backend: str = "redis://redis:6379/1"
+    celery_broker_pool_limit: int = 10
+    celery_serializer: str = "json"  # "json" or "msgpack" for messages and results
+    celery_result_expires: int = 3600  # Seconds before results are evicted
+    celery_task_compression: Optional[str] = None
+    celery_result_compression: Optional[str] = None  # e.g. "zlib", "bz2"
+    celery_result_compression_min_bytes: int = 1024  # Smaller results are stored as is
+    
+    # Task submission rate limits (token buckets, tokens per second / burst)
+    rate_limit_enabled: bool = True
+    rate_limit_client_rate: float = 20.0
+    rate_limit_client_burst: int = 40
+    rate_limit_task_type_rate: float = 200.0
+    rate_limit_task_type_burst: int = 400
+    # Comma-separated proxy IPs/CIDRs whose X-Client-ID / X-Forwarded-For are trusted
+    rate_limit_trusted_proxies: str = ""
+    
+    # Admission control: reject submissions while the broker backlog is too deep
+    admission_max_queue_depth: int = 10000
+    admission_retry_after: int = 5  # Seconds suggested to rejected clients
+    
+    # Memoization of tasks declared with memoize=True
+    memoize_enabled: bool = True
+    memoize_ttl: int = 300  # Capped at celery_result_expires
+    memoize_max_entries: int = 10000
     
     # Service Type (backend, worker, beat)
     service_type: str = "backend"
     
+    # Maintenance jobs (run by Celery beat)
+    archive_interval_seconds: int = 300
+    archive_after_days: int = 7  # Archive entries not updated for this long
+    archive_batch_size: int = 1000
+    archive_max_batches: int = 50  # Upper bound on documents moved per run
+    task_purge_interval_seconds: int = 3600
+    task_retention_days: int = 3
+    
+    # Bulk data entry operations
+    bulk_max_ids: int = 1000  # Max ids per bulk request
+    bulk_sync_limit: int = 10000  # Filters matching more run as a background job
+    bulk_batch_size: int = 1000
+    
+    # Data entry queries
+    data_query_max_limit: int = 500
+    data_query_max_skip: int = 10000
+    data_query_max_time_ms: int = 2000  # Server-side time limit per query
+    query_guard_enabled: bool = True
+    query_guard_max_in_flight: int = 20  # Reject unindexed query shapes above this many in-flight requests per process
+    
+    # Backend server mode: "single" (one uvicorn process) or "multi"
+    # (gunicorn managing uvicorn worker processes)
+    server_mode: str = "single"
+    web_concurrency: int = 0  # 0 = auto-size from the container CPU quota
+    web_workers_per_cpu: float = 2.0
+    server_graceful_timeout: int = 30
+    server_keepalive: int = 5
+    server_max_requests: int = 0  # Recycle a process after N requests, 0 = never
+    
+    # Seconds allowed for the startup connection checks
+    startup_timeout: float = 10.0
+    
     # Worker Configuration
     worker_concurrency: int = 4
     worker_prefetch_multiplier: int = 4
+    # Pool processes are replaced once their peak RSS exceeds this (prefork only)
+    worker_max_memory_per_child_kb: int = 102400
+    worker_max_tasks_per_child: int = 0  # 0 = no task-count limit
+    
+    # Per-task resource telemetry
+    task_telemetry_enabled: bool = True
+    task_telemetry_tracemalloc_rate: float = 0.01  # Fraction of tasks run under tracemalloc
+    task_telemetry_ttl: int = 86400
     
     @property
     def mongodb_connection_url(self) -> str:
@@ -43,6 +139,30 @@ class Settings(BaseSettings):
             return f"mongodb://{self.mongodb_username}:{self.mongodb_password}@{base_url}"
         return self.mongodb_url
     
+    @property
+    def mongodb_client_options(self) -> dict:
+        """Keyword arguments for MongoClient built from the tuning settings."""
+        options = {
+            "maxPoolSize": self.mongodb_max_pool_size,
+            "minPoolSize": self.mongodb_min_pool_size,
+            "connectTimeoutMS": self.mongodb_connect_timeout_ms,
+            "serverSelectionTimeoutMS": self.mongodb_server_selection_timeout_ms,
+            "readPreference": self.mongodb_read_preference,
+            "w": int(self.mongodb_write_concern)
+            if self.mongodb_write_concern.isdigit()
+            else self.mongodb_write_concern,
+        }
+        if self.mongodb_max_idle_time_ms is not None:
+            options["maxIdleTimeMS"] = self.mongodb_max_idle_time_ms
+        if self.mongodb_wait_queue_timeout_ms is not None:
+            options["waitQueueTimeoutMS"] = self.mongodb_wait_queue_timeout_ms
+        if self.mongodb_socket_timeout_ms is not None:
+            options["socketTimeoutMS"] = self.mongodb_socket_timeout_ms
+        compressors = [c.strip() for c in self.mongodb_compressors.split(",") if c.strip()]
+        if compressors:
+            options["compressors"] = compressors
+        return options
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
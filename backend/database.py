@@ -1,14 +1,142 @@
 """
 MongoDB database connection and utilities.
 """
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, TEXT, MongoClient, monitoring
 from pymongo.database import Database
 from pymongo.collection import Collection
 from config import settings
+from tracing import tracer, current_span_var
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Indexes per collection as (keys, options) pairs
+INDEXES = {
+    "data_entries": [
+        ([("created_at", DESCENDING)], {}),
+        ([("status", ASCENDING), ("created_at", DESCENDING)], {}),
+        ([("value", ASCENDING)], {}),
+        ([("name", ASCENDING)], {}),
+        ([("name", TEXT), ("description", TEXT)], {"name": "data_entries_text"}),
+        ([("updated_at", ASCENDING)], {}),
+    ],
+    "data_entries_archive": [
+        ([("archived_at", ASCENDING)], {}),
+    ],
+    "tasks": [
+        ([("task_id", ASCENDING)], {"unique": True}),
+        ([("created_at", ASCENDING)], {}),
+    ],
+}
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collects connection pool utilization and checkout wait times."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open_connections = 0
+        self.in_use = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+    
+    def stats(self) -> dict:
+        """Return a snapshot of the pool statistics."""
+        with self._lock:
+            return {
+                "max_size": settings.mongodb_max_pool_size,
+                "open_connections": self.open_connections,
+                "in_use": self.in_use,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": self.total_wait_ms / self.checkouts if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_ms,
+            }
+    
+    # Checkout events are published on the thread doing the checkout, so the
+    # start timestamp can be kept in a thread-local.
+    
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+    
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        wait_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+    
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+
+
+class CommandTracingListener(monitoring.CommandListener):
+    """Records a span per MongoDB command issued within a trace."""
+    
+    def __init__(self):
+        self._spans = {}
+    
+    def started(self, event):
+        if not tracer.enabled or current_span_var.get() is None:
+            return
+        collection = event.command.get(event.command_name)
+        self._spans[(event.request_id, event.connection_id)] = tracer.start_span(
+            f"mongodb {event.command_name}",
+            kind="client",
+            attributes={
+                "db.system": "mongodb",
+                "db.name": event.database_name,
+                "db.operation": event.command_name,
+                "db.collection": collection if isinstance(collection, str) else None,
+            }
+        )
+    
+    def succeeded(self, event):
+        span = self._spans.pop((event.request_id, event.connection_id), None)
+        if span:
+            tracer.end_span(span)
+    
+    def failed(self, event):
+        span = self._spans.pop((event.request_id, event.connection_id), None)
+        if span:
+            span.error = str(event.failure)
+            tracer.end_span(span)
+
 
 class MongoDB:
     """MongoDB connection manager."""
@@ -16,11 +144,17 @@ class MongoDB:
     def __init__(self):
         self.client: MongoClient = None
         self.db: Database = None
+        self.pool_listener = PoolStatsListener()
+        self.command_listener = CommandTracingListener()
     
     def connect(self):
         """Connect to MongoDB."""
         try:
-            self.client = MongoClient(settings.mongodb_connection_url)
+            self.client = MongoClient(
+                settings.mongodb_connection_url,
+                event_listeners=[self.pool_listener, self.command_listener],
+                **settings.mongodb_client_options
+            )
             self.db = self.client[settings.mongodb_database]
             # Test connection
             self.client.admin.command('ping')
@@ -37,9 +171,20 @@ class MongoDB:
     
     def get_collection(self, name: str) -> Collection:
         """Get a collection by name."""
-        if not self.db:
+        if self.db is None:
             raise RuntimeError("Database not connected")
         return self.db[name]
+    
+    def ensure_indexes(self):
+        """Create the indexes the API and maintenance jobs rely on (idempotent)."""
+        for collection, indexes in INDEXES.items():
+            for keys, options in indexes:
+                self.get_collection(collection).create_index(keys, background=True, **options)
+        logger.info("MongoDB indexes ensured")
+    
+    def pool_stats(self) -> dict:
+        """Get connection pool utilization and wait-time statistics."""
+        return self.pool_listener.stats()
 
 
 # Global MongoDB instance
@@ -49,3 +194,11 @@ mongodb = MongoDB()
 def get_db() -> Database:
     """Dependency for getting database instance."""
     return mongodb.db
+
+
+def get_worker_db() -> Database:
+    """Database for Celery tasks; connects lazily so each worker process opens its own client."""
+    if mongodb.db is None:
+        mongodb.connect()
+        mongodb.ensure_indexes()
+    return mongodb.db
@@ -5,8 +5,22 @@ echo "Service Type: ${SERVICE_TYPE}"
 
 case "${SERVICE_TYPE}" in
   backend)
-    echo "Starting FastAPI Backend on port 8000..."
-    exec uvicorn main:app --host 0.0.0.0 --port 8000
+    case "${SERVER_MODE:-single}" in
+      multi)
+        echo "Starting FastAPI Backend on port 8000 (multi-process)..."
+        echo "Workers: ${WEB_CONCURRENCY:-auto}"
+        exec gunicorn main:app -c gunicorn_conf.py
+        ;;
+      single)
+        echo "Starting FastAPI Backend on port 8000..."
+        exec uvicorn main:app --host 0.0.0.0 --port 8000 --no-access-log
+        ;;
+      *)
+        echo "ERROR: Unknown SERVER_MODE: ${SERVER_MODE}"
+        echo "Valid options: single, multi"
+        exit 1
+        ;;
+    esac
     ;;
   
   worker)
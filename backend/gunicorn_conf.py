@@ -0,0 +1,57 @@
+"""
+Gunicorn configuration for the multi-process backend server mode.
+
+Each worker process runs the FastAPI lifespan on its own, so MongoDB and
+Redis connections are created after the fork. Send SIGHUP to the master
+process for a graceful reload of all workers.
+"""
+import math
+import os
+
+from config import settings
+
+
+def cpu_limit() -> float:
+    """Return the CPU quota of the container's cgroup, or the host CPU count."""
+    # cgroup v2
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return float(len(os.sched_getaffinity(0)))
+
+
+def worker_count() -> int:
+    """Number of worker processes to run."""
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    return max(1, math.ceil(cpu_limit() * settings.web_workers_per_cpu))
+
+
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = worker_count()
+# Connections must not be inherited across fork; every worker imports the
+# app and opens its own clients in lifespan.
+preload_app = False
+graceful_timeout = settings.server_graceful_timeout
+timeout = settings.server_graceful_timeout + 30
+keepalive = settings.server_keepalive
+max_requests = settings.server_max_requests
+max_requests_jitter = settings.server_max_requests // 10
+loglevel = settings.log_level
+accesslog = None
+errorlog = "-"
@@ -0,0 +1,175 @@
+"""
+Structured logging with a non-blocking queue handler.
+
+Loggers only enqueue records; a listener thread formats them (as JSON by
+default) and writes them to stdout, so a slow stdout does not add latency
+to requests or tasks. Every record carries the request id of the HTTP
+request it belongs to, which is also forwarded to Celery tasks in a
+message header.
+"""
+from contextvars import ContextVar
+from datetime import datetime, timezone
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from config import settings
+
+request_id_var: ContextVar = ContextVar("request_id", default=None)
+task_id_var: ContextVar = ContextVar("task_id", default=None)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Standard LogRecord attributes; anything else on a record came from extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "task_id"}
+
+access_logger = logging.getLogger("access")
+
+_listener = None
+_listener_pid = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including correlation ids and extra fields."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("request_id", "task_id"):
+            value = getattr(record, key, None)
+            if value:
+                entry[key] = value
+        entry.update((k, v) for k, v in vars(record).items() if k not in _RECORD_ATTRS)
+        return json.dumps(entry, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Attach the current request and task ids before the record is queued."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.task_id = task_id_var.get()
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+    
+    dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(stream=None):
+    """
+    Route all logging through a bounded queue to a listener thread.
+    
+    Safe to call again, e.g. in a forked worker process, whose copy of the
+    parent's listener thread does not run.
+    """
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+    
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    log_queue = queue.Queue(settings.log_queue_size)
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(getattr(logging, settings.log_level.upper()))
+    # Server and Celery loggers go through the same pipeline
+    for name in ("uvicorn", "uvicorn.error", "gunicorn.error", "celery"):
+        logger = logging.getLogger(name)
+        logger.handlers = []
+        logger.propagate = True
+    # Replaced by the access log written by RequestContextMiddleware
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    
+    _listener = logging.handlers.QueueListener(log_queue, output)
+    _listener_pid = os.getpid()
+    _listener.start()
+    return handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+
+
+def _sampled_paths() -> set:
+    return {p.strip() for p in settings.log_sample_paths.split(",") if p.strip()}
+
+
+def should_log_request(path: str, status_code: int) -> bool:
+    """Keep a log_sample_rate fraction of successful requests to sampled paths."""
+    if status_code >= 400 or path not in _sampled_paths():
+        return True
+    return random.random() < settings.log_sample_rate
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware that assigns a request id and writes the access log.
+    
+    The id is taken from X-Request-ID when the client sends one and is
+    returned in the X-Request-ID response header.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            if settings.log_access and should_log_request(scope["path"], status_code):
+                access_logger.info(
+                    "%s %s %s", scope["method"], scope["path"], status_code,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+                    }
+                )
+            request_id_var.reset(token)
@@ -4,46 +4,70 @@ LoadTest Demo Application - FastAPI Backend
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
 
 from config import settings
 from database import mongodb
 from redis_client import redis_client
 from api.routes import router
+from tasks import get_task_map
+from logging_config import setup_logging, shutdown_logging, RequestContextMiddleware
+from tracing import tracer, TracingMiddleware
+from query_guard import InFlightMiddleware
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
 
+def log_background_failure(future: asyncio.Future):
+    """Log the error of a startup job that nothing awaits."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background startup job failed", exc_info=future.exception())
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
-    logger.info(f"Starting {settings.app_name} in {settings.app_env} mode")
+    # Runs once per server process, so each worker opens its own connections
+    logger.info(f"Starting {settings.app_name} in {settings.app_env} mode (pid {os.getpid()})")
     
     try:
-        # Connect to MongoDB
-        mongodb.connect()
-        
-        # Connect to Redis
-        redis_client.connect()
+        # Connect to MongoDB and Redis concurrently; each blocks on a ping
+        await asyncio.wait_for(
+            asyncio.gather(
+                asyncio.to_thread(mongodb.connect),
+                asyncio.to_thread(redis_client.connect)
+            ),
+            timeout=settings.startup_timeout
+        )
         
         logger.info("All connections established successfully")
+    except asyncio.TimeoutError:
+        logger.error(f"Connections not established within {settings.startup_timeout}s")
+        raise
     except Exception as e:
         logger.error(f"Failed to establish connections: {e}")
         raise
     
+    # Resolve the task registry and ensure indexes in the background so
+    # readiness is not delayed by importing Celery or index builds
+    loop = asyncio.get_running_loop()
+    loop.run_in_executor(None, get_task_map).add_done_callback(log_background_failure)
+    loop.run_in_executor(None, mongodb.ensure_indexes).add_done_callback(log_background_failure)
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application")
     mongodb.disconnect()
     redis_client.disconnect()
+    tracer.flush()
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -61,8 +85,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],  # Read by the frontend to pace retries
 )
 
+# In-flight request count that the query guard uses as its load signal
+app.add_middleware(InFlightMiddleware)
+
+# Server spans, inside the request id middleware so spans carry the id
+app.add_middleware(TracingMiddleware)
+
+# Request ids and access log; added last so it wraps every other middleware
+app.add_middleware(RequestContextMiddleware)
+
 # Include API routes
 app.include_router(router)
 
@@ -0,0 +1,164 @@
+"""
+Memoization and single-flight for deterministic task submissions.
+
+Tasks opt in with ``@celery_app.task(..., memoize=True)``. Submissions of
+such a task with the same canonical params within memoize_ttl share one
+execution: the first reserves a task id under the params key and enqueues
+it, later (and concurrent) submissions get that task id back and follow
+the same result instead of enqueueing a new run.
+"""
+import hashlib
+import inspect
+import json
+import uuid
+import redis
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "memo:index"
+
+# Celery states of executions a new submission may attach to; anything else
+# (failed, revoked, rejected) is forgotten so the next submission reruns
+REUSABLE_STATES = {"PENDING", "STARTED", "PROGRESS", "RETRY", "SUCCESS"}
+
+# Reserve a task id for a params key unless one is already reserved, and
+# keep the number of entries bounded by evicting the least recently used.
+# Index members are touched on every hit (here and in LOOKUP_SCRIPT);
+# members idle for longer than the TTL are dropped first since their keys
+# have expired.
+#
+# KEYS: entry key, index key
+# ARGV: candidate task id, ttl seconds, max entries
+# Returns: the reserved task id (the candidate if it was stored)
+RESERVE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1])
+local ttl = tonumber(ARGV[2])
+
+local existing = redis.call('GET', KEYS[1])
+if existing then
+    redis.call('ZADD', KEYS[2], now, KEYS[1])
+    return existing
+end
+
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+redis.call('ZADD', KEYS[2], now, KEYS[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now - ttl)
+
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[3])
+if excess > 0 then
+    local victims = redis.call('ZPOPMIN', KEYS[2], excess)
+    for i = 1, #victims, 2 do
+        redis.call('DEL', victims[i])
+    end
+end
+return ARGV[1]
+"""
+
+# Get the task id reserved for a params key and mark the entry as used.
+#
+# KEYS: entry key, index key
+# Returns: the task id, or nil
+LOOKUP_SCRIPT = """
+local existing = redis.call('GET', KEYS[1])
+if existing then
+    redis.call('ZADD', KEYS[2], 'XX', tonumber(redis.call('TIME')[1]), KEYS[1])
+end
+return existing
+"""
+
+
+def canonical_params(task, params: dict) -> str:
+    """
+    Params as canonical JSON, with the task's defaults filled in so that
+    omitting a parameter and passing its default share one entry.
+    """
+    try:
+        bound = inspect.signature(task.run).bind(**params)
+        bound.apply_defaults()
+        params = bound.arguments
+    except TypeError:
+        pass
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class TaskMemo:
+    """Maps (task name, canonical params) to the task id of a shared execution."""
+    
+    def __init__(self):
+        self._scripts = {}
+    
+    def _script(self, client: redis.Redis, source: str):
+        if source not in self._scripts:
+            self._scripts[source] = client.register_script(source)
+        return self._scripts[source]
+    
+    def enabled_for(self, task, ignore_result: bool) -> bool:
+        # Fire-and-forget runs store no result to share
+        return settings.memoize_enabled and getattr(task, "memoize", False) and not ignore_result
+    
+    def key(self, task, params: dict) -> str:
+        digest = hashlib.sha256(canonical_params(task, params).encode()).hexdigest()
+        return f"memo:{task.name}:{digest}"
+    
+    def ttl(self) -> int:
+        # An entry must not outlive the stored result it points to
+        return min(settings.memoize_ttl, settings.celery_result_expires)
+    
+    def lookup(self, client: redis.Redis, key: str, result_state) -> tuple:
+        """
+        (task id, Celery state) of a reusable execution, or (None, None).
+        
+        Executions that failed or were revoked are forgotten so the next
+        submission reruns. result_state maps a task id to its Celery state.
+        """
+        try:
+            task_id = self._script(client, LOOKUP_SCRIPT)(keys=[key, INDEX_KEY])
+            if not task_id:
+                return None, None
+            if isinstance(task_id, bytes):
+                task_id = task_id.decode()
+            state = result_state(task_id)
+            if state not in REUSABLE_STATES:
+                client.delete(key)
+                client.zrem(INDEX_KEY, key)
+                return None, None
+            return task_id, state
+        except redis.RedisError as e:
+            logger.warning("Task memo unavailable, running task", extra={"error": str(e)})
+            return None, None
+    
+    def reserve(self, client: redis.Redis, key: str) -> tuple:
+        """
+        Reserve a new task id for key.
+        
+        Returns (task_id, reserved): reserved is False when a concurrent
+        submission got there first and task_id is its execution. Falls back
+        to an unshared run when Redis cannot be reached.
+        """
+        candidate = str(uuid.uuid4())
+        try:
+            task_id = self._script(client, RESERVE_SCRIPT)(
+                keys=[key, INDEX_KEY],
+                args=[candidate, self.ttl(), settings.memoize_max_entries]
+            )
+        except redis.RedisError as e:
+            logger.warning("Task memo unavailable, running task", extra={"error": str(e)})
+            return candidate, True
+        if isinstance(task_id, bytes):
+            task_id = task_id.decode()
+        return task_id, task_id == candidate
+    
+    def release(self, client: redis.Redis, key: str):
+        """Drop a reservation whose task could not be enqueued."""
+        try:
+            client.delete(key)
+            client.zrem(INDEX_KEY, key)
+        except redis.RedisError as e:
+            logger.warning("Failed to release task memo entry", extra={"memo_key": key, "error": str(e)})
+
+
+# Global task memo instance
+task_memo = TaskMemo()
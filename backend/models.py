@@ -1,10 +1,11 @@
 """
 Pydantic models for request/response validation.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, Any
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, Any, List
 from datetime import datetime
 from enum import Enum
+import re
 
 
 class TaskStatus(str, Enum):
@@ -57,12 +58,87 @@ class DataEntry(DataEntryBase):
         populate_by_name = True
 
 
+class DataEntryFilter(BaseModel):
+    """Filter selecting data entries for bulk operations."""
+    status: Optional[DataEntryStatus] = None
+    value_min: Optional[float] = None
+    value_max: Optional[float] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    name_prefix: Optional[str] = Field(None, min_length=1, max_length=100)
+    search: Optional[str] = Field(None, min_length=1, max_length=200)
+    
+    def to_query(self) -> dict:
+        """Build the MongoDB query for this filter."""
+        query = {}
+        if self.status is not None:
+            query["status"] = self.status.value
+        value = {}
+        if self.value_min is not None:
+            value["$gte"] = self.value_min
+        if self.value_max is not None:
+            value["$lte"] = self.value_max
+        if value:
+            query["value"] = value
+        created_at = {}
+        if self.created_after is not None:
+            created_at["$gte"] = self.created_after
+        if self.created_before is not None:
+            created_at["$lt"] = self.created_before
+        if created_at:
+            query["created_at"] = created_at
+        if self.name_prefix is not None:
+            # Anchored and case-sensitive so the name index bounds the scan
+            query["name"] = {"$regex": f"^{re.escape(self.name_prefix)}"}
+        if self.search is not None:
+            query["$text"] = {"$search": self.search}
+        return query
+
+
+class DataEntryBulkSelection(BaseModel):
+    """Selects data entries by id list or by filter (exactly one)."""
+    ids: Optional[List[str]] = None
+    filter: Optional[DataEntryFilter] = None
+    
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        if self.ids is not None and not self.ids:
+            raise ValueError("'ids' must not be empty")
+        if self.filter is not None and not self.filter.to_query():
+            raise ValueError("'filter' must set at least one condition")
+        return self
+
+
+class DataEntryBulkUpdate(DataEntryBulkSelection):
+    """Model for updating many data entries at once."""
+    update: DataEntryUpdate
+
+
+class DataEntryBulkDelete(DataEntryBulkSelection):
+    """Model for deleting many data entries at once."""
+    pass
+
+
+class BulkOperationResult(BaseModel):
+    """Model for a bulk operation response; task_id is set when it runs in the background."""
+    matched: int
+    modified: int = 0
+    deleted: int = 0
+    task_id: Optional[str] = None
+
+
 # Task Models
 
 class TaskCreate(BaseModel):
     """Model for creating a task."""
     task_type: str = Field(..., description="Type of task to execute")
     params: Optional[dict[str, Any]] = Field(default_factory=dict)
+    ignore_result: bool = Field(
+        False,
+        description="Fire-and-forget: do not store progress or the result"
+    )
 
 
 class TaskResponse(BaseModel):
@@ -73,6 +149,14 @@ class TaskResponse(BaseModel):
     created_at: datetime
     result: Optional[Any] = None
     error: Optional[str] = None
+    progress: Optional[dict[str, Any]] = Field(
+        None,
+        description="Latest progress (current, total, status) while the task is in progress"
+    )
+    memoized: bool = Field(
+        False,
+        description="Attached to an existing execution with the same params"
+    )
 
 
 # Health Check Models
@@ -94,3 +178,40 @@ class Metrics(BaseModel):
     completed_tasks: int
     failed_tasks: int
     total_data_entries: int
+
+
+class PoolStats(BaseModel):
+    """Model for a single connection pool's utilization statistics."""
+    max_size: Optional[int] = None
+    open_connections: int
+    in_use: int
+    checkouts: int
+    checkout_failures: int = 0
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class ConnectionPoolMetrics(BaseModel):
+    """Model for connection pool metrics of the serving process."""
+    mongodb: PoolStats
+    redis: dict[str, PoolStats]
+
+
+class TaskResourceStats(BaseModel):
+    """Model for resource usage of one task type, aggregated over executions."""
+    executions: int
+    failures: int
+    avg_wall_ms: float
+    max_wall_ms: float
+    avg_cpu_ms: float
+    max_cpu_ms: float
+    cpu_utilization: float
+    avg_rss_delta_kb: float
+    max_rss_delta_kb: float
+    total_peak_rss_growth_kb: float
+    max_peak_rss_growth_kb: float
+    avg_allocated_blocks_delta: float
+    tracemalloc_samples: int
+    avg_tracemalloc_peak_kb: Optional[float] = None
+    max_tracemalloc_peak_kb: Optional[float] = None
+    recycle_triggers: int
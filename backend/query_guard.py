@@ -0,0 +1,71 @@
+"""
+Load-dependent guard for data entry query shapes.
+"""
+from config import settings
+from models import DataEntryFilter
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Filter shapes (the top-level fields of DataEntryFilter.to_query) for which
+# one index in database.INDEXES selects every condition and also returns the
+# newest-first order of the listing. Everything else, including the value,
+# name and $text shapes whose indexes serve bulk filters, ends in a blocking
+# in-memory sort of the whole match set.
+INDEXED_SHAPES = {
+    frozenset(),                              # created_at
+    frozenset({"created_at"}),                # created_at
+    frozenset({"status"}),                    # status, created_at
+    frozenset({"status", "created_at"}),      # status, created_at
+}
+
+
+class QueryGuard:
+    """Rejects unindexed query shapes while this process is busy."""
+    
+    def __init__(self):
+        # Maintained by InFlightMiddleware on the event loop thread
+        self.in_flight = 0
+    
+    def is_indexed(self, entry_filter: DataEntryFilter) -> bool:
+        return frozenset(entry_filter.to_query()) in INDEXED_SHAPES
+    
+    def under_load(self) -> bool:
+        """Whether this process is serving more than query_guard_max_in_flight requests."""
+        return self.in_flight > settings.query_guard_max_in_flight
+    
+    def check(self, entry_filter: DataEntryFilter) -> int:
+        """
+        Returns 0 if the query may run, otherwise the number of seconds the
+        client should wait before retrying.
+        """
+        if not settings.query_guard_enabled or self.is_indexed(entry_filter):
+            return 0
+        if self.under_load():
+            logger.warning(
+                "Rejected unindexed data query shape",
+                extra={"query_fields": sorted(entry_filter.to_query()), "in_flight": self.in_flight}
+            )
+            return settings.admission_retry_after
+        return 0
+
+
+# Global query guard instance
+query_guard = QueryGuard()
+
+
+class InFlightMiddleware:
+    """ASGI middleware that counts the HTTP requests in flight for the query guard."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        query_guard.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            query_guard.in_flight -= 1
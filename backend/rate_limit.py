@@ -0,0 +1,108 @@
+"""
+Rate limiting and admission control for task submission.
+"""
+import math
+import redis
+from config import settings
+from redis_client import get_connection_pool
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Token buckets for the client and the task type, refilled from Redis server
+# time. Tokens are only taken when both buckets allow the request so a
+# rejection by one limit never drains the other.
+#
+# KEYS: client bucket, task type bucket
+# ARGV: client rate, client burst, task type rate, task type burst
+# Returns: {allowed (0/1), retry_after_ms}
+TOKEN_BUCKET_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local allowed = 1
+local retry_after = 0
+local tokens = {}
+
+for i = 1, #KEYS do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local available = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    available = math.min(burst, available + math.max(0, now - ts) * rate / 1000)
+    if available < 1 then
+        allowed = 0
+        retry_after = math.max(retry_after, math.ceil((1 - available) * 1000 / rate))
+    end
+    tokens[i] = available
+end
+
+for i = 1, #KEYS do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    local remaining = tokens[i]
+    if allowed == 1 then
+        remaining = remaining - 1
+    end
+    redis.call('HSET', KEYS[i], 'tokens', remaining, 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], math.ceil(burst * 1000 / rate) + 1000)
+end
+
+return {allowed, retry_after}
+"""
+
+
+class AdmissionController:
+    """Decides whether a task submission may be enqueued."""
+    
+    def __init__(self):
+        self._script = None
+    
+    def _bucket_script(self, client: redis.Redis):
+        if self._script is None:
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+    
+    def queue_depth(self, queue: str) -> int:
+        """Number of messages waiting in a broker queue."""
+        broker = redis.Redis(connection_pool=get_connection_pool(settings.celery_broker_url))
+        return broker.llen(queue)
+    
+    def check(self, client: redis.Redis, client_id: str, task_type: str, queue: str) -> int:
+        """
+        Check queue depth and rate limits for a submission.
+        
+        Returns 0 if the task may be enqueued, otherwise the number of
+        seconds the client should wait before retrying. Fails open when
+        Redis cannot be reached so a broker hiccup does not reject everything.
+        """
+        if not settings.rate_limit_enabled:
+            return 0
+        
+        try:
+            if self.queue_depth(queue) >= settings.admission_max_queue_depth:
+                return settings.admission_retry_after
+            
+            allowed, retry_after_ms = self._bucket_script(client)(
+                keys=[
+                    f"ratelimit:client:{client_id}",
+                    f"ratelimit:task_type:{task_type}"
+                ],
+                args=[
+                    settings.rate_limit_client_rate,
+                    settings.rate_limit_client_burst,
+                    settings.rate_limit_task_type_rate,
+                    settings.rate_limit_task_type_burst
+                ]
+            )
+        except redis.RedisError as e:
+            logger.warning("Admission control unavailable, allowing request", extra={"error": str(e)})
+            return 0
+        
+        if allowed:
+            return 0
+        return max(1, math.ceil(retry_after_ms / 1000))
+
+
+# Global admission controller instance
+admission_controller = AdmissionController()
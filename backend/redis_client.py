@@ -3,11 +3,109 @@ Redis client connection and utilities.
 """
 import redis
 from config import settings
+from tracing import tracer, current_span_var
+import threading
+import time
+import re
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Blocking connection pool that tracks utilization and checkout wait time."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+    
+    def get_connection(self, command_name, *keys, **options):
+        started = time.perf_counter()
+        connection = super().get_connection(command_name, *keys, **options)
+        wait_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        return connection
+    
+    def stats(self) -> dict:
+        """Return a snapshot of the pool statistics."""
+        # Idle connections sit in the queue; None entries are unopened slots.
+        idle = sum(1 for conn in list(self.pool.queue) if conn is not None)
+        open_connections = len(self._connections)
+        with self._stats_lock:
+            return {
+                "max_size": self.max_connections,
+                "open_connections": open_connections,
+                "in_use": open_connections - idle,
+                "checkouts": self.checkouts,
+                "avg_wait_ms": self.total_wait_ms / self.checkouts if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+
+_pools: dict[tuple[str, bool], InstrumentedConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(url: str, decode_responses: bool = True) -> InstrumentedConnectionPool:
+    """
+    Get the process-wide connection pool for a Redis URL.
+    
+    Pools are created once per (url, decode_responses) pair, so all API
+    clients share one pool and all Celery result lookups share another
+    (the result backend uses its own database and raw responses).
+    """
+    key = (url, decode_responses)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = InstrumentedConnectionPool.from_url(
+                url,
+                decode_responses=decode_responses,
+                max_connections=settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout,
+                socket_timeout=settings.redis_socket_timeout,
+                socket_connect_timeout=settings.redis_socket_connect_timeout,
+                health_check_interval=settings.redis_health_check_interval,
+            )
+            _pools[key] = pool
+        return pool
+
+
+def get_pool_stats() -> dict:
+    """Get statistics for every Redis connection pool in this process."""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {
+        # Mask credentials before the URL is used as a label
+        re.sub(r"//[^@/]*@", "//***@", url) + ("" if decode else " (raw)"): pool.stats()
+        for (url, decode), pool in pools.items()
+    }
+
+
+def close_connection_pools():
+    """Disconnect and forget every pool in the registry."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.disconnect()
+        _pools.clear()
+
+
+class TracedRedis(redis.Redis):
+    """Redis client that records a span per command issued within a trace."""
+    
+    def execute_command(self, *args, **options):
+        if not tracer.enabled or current_span_var.get() is None:
+            return super().execute_command(*args, **options)
+        with tracer.span(f"redis {args[0]}", kind="client", **{"db.system": "redis"}):
+            return super().execute_command(*args, **options)
+
+
 class RedisClient:
     """Redis connection manager."""
     
@@ -17,9 +115,8 @@ class RedisClient:
     def connect(self):
         """Connect to Redis."""
         try:
-            self.client = redis.from_url(
-                settings.redis_url,
-                decode_responses=True
+            self.client = TracedRedis(
+                connection_pool=get_connection_pool(settings.redis_url)
             )
             # Test connection
             self.client.ping()
@@ -32,6 +129,7 @@ class RedisClient:
         """Disconnect from Redis."""
         if self.client:
             self.client.close()
+            close_connection_pools()
             logger.info("Disconnected from Redis")
     
     def get_client(self) -> redis.Redis:
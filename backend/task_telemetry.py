@@ -0,0 +1,95 @@
+"""
+Per-task-type resource accounting aggregated in Redis.
+
+Workers record one sample per task execution (see tasks/telemetry.py);
+samples from all workers and pool processes are folded into one hash per
+task type, which the API and the worker inspect command read back.
+"""
+import redis
+from config import settings
+from redis_client import get_connection_pool
+import logging
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "telemetry:task:"
+
+# Fold a sample into an aggregate hash: fields ending in _max keep the
+# maximum, all others are summed.
+#
+# KEYS: aggregate key
+# ARGV: ttl seconds, then field/value pairs
+RECORD_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    local field = ARGV[i]
+    local value = tonumber(ARGV[i + 1])
+    if string.sub(field, -4) == '_max' then
+        local current = tonumber(redis.call('HGET', KEYS[1], field))
+        if not current or value > current then
+            redis.call('HSET', KEYS[1], field, value)
+        end
+    else
+        redis.call('HINCRBYFLOAT', KEYS[1], field, value)
+    end
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+return 1
+"""
+
+
+class TaskTelemetry:
+    """Records and reads per-task-type CPU, wall time, memory and allocation totals."""
+    
+    def __init__(self):
+        self._script = None
+    
+    def _client(self) -> redis.Redis:
+        return redis.Redis(connection_pool=get_connection_pool(settings.redis_url))
+    
+    def record(self, task_name: str, sample: dict):
+        """Add one execution's measurements; never raises so tasks are unaffected."""
+        args = [settings.task_telemetry_ttl]
+        for field, value in sample.items():
+            args += [field, value]
+        try:
+            if self._script is None:
+                self._script = self._client().register_script(RECORD_SCRIPT)
+            self._script(keys=[KEY_PREFIX + task_name], args=args, client=self._client())
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record telemetry for {task_name}: {e}")
+    
+    def read(self, client: redis.Redis = None) -> dict:
+        """Aggregates per task type with per-execution averages."""
+        client = client or self._client()
+        result = {}
+        for key in client.scan_iter(match=KEY_PREFIX + "*", count=100):
+            raw = {k: float(v) for k, v in client.hgetall(key).items()}
+            count = raw.get("count", 0)
+            if not count:
+                continue
+            name = key[len(KEY_PREFIX):] if isinstance(key, str) else key.decode()[len(KEY_PREFIX):]
+            wall = raw.get("wall_seconds", 0.0)
+            alloc_samples = raw.get("tracemalloc_samples", 0)
+            result[name] = {
+                "executions": int(count),
+                "failures": int(raw.get("failures", 0)),
+                "avg_wall_ms": round(wall / count * 1000, 2),
+                "max_wall_ms": round(raw.get("wall_seconds_max", 0.0) * 1000, 2),
+                "avg_cpu_ms": round(raw.get("cpu_seconds", 0.0) / count * 1000, 2),
+                "max_cpu_ms": round(raw.get("cpu_seconds_max", 0.0) * 1000, 2),
+                "cpu_utilization": round(raw.get("cpu_seconds", 0.0) / wall, 3) if wall else 0.0,
+                "avg_rss_delta_kb": round(raw.get("rss_delta_kb", 0.0) / count, 1),
+                "max_rss_delta_kb": raw.get("rss_delta_kb_max", 0.0),
+                "total_peak_rss_growth_kb": raw.get("peak_rss_growth_kb", 0.0),
+                "max_peak_rss_growth_kb": raw.get("peak_rss_growth_kb_max", 0.0),
+                "avg_allocated_blocks_delta": round(raw.get("allocated_blocks", 0.0) / count, 1),
+                "tracemalloc_samples": int(alloc_samples),
+                "avg_tracemalloc_peak_kb": round(raw.get("tracemalloc_peak_kb", 0.0) / alloc_samples, 1) if alloc_samples else None,
+                "max_tracemalloc_peak_kb": round(raw.get("tracemalloc_peak_kb_max", 0.0), 1) if alloc_samples else None,
+                "recycle_triggers": int(raw.get("recycle_triggers", 0)),
+            }
+        return dict(sorted(result.items()))
+
+
+# Global task telemetry instance
+task_telemetry = TaskTelemetry()
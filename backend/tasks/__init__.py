@@ -1,3 +1,34 @@
 """
 Celery task definitions.
 """
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_celery_app():
+    """Return the Celery app, importing it on first use."""
+    from celery_app import celery_app
+    return celery_app
+
+
+@lru_cache(maxsize=None)
+def get_task_map(ignore_result: bool = False) -> dict:
+    """
+    Map API task types to Celery tasks.
+    
+    With ignore_result, map to the fire-and-forget variants, which write
+    nothing to the result backend. Resolved once per process. Importing the
+    task module pulls in Celery, so only services that submit tasks pay for it.
+    """
+    from tasks import celery_tasks
+    if ignore_result:
+        return {
+            "process_data": celery_tasks.process_data_fire_and_forget,
+            "generate_report": celery_tasks.generate_report_fire_and_forget,
+            "simulate_load": celery_tasks.simulate_load_fire_and_forget
+        }
+    return {
+        "process_data": celery_tasks.process_data,
+        "generate_report": celery_tasks.generate_report,
+        "simulate_load": celery_tasks.simulate_load
+    }
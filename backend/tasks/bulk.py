@@ -0,0 +1,95 @@
+"""
+Background bulk operations on data entries.
+
+Used by PATCH/DELETE /api/data when a filter matches more than
+bulk_sync_limit entries.
+"""
+from celery_app import celery_app
+from config import settings
+from database import get_worker_db
+from models import DataEntryFilter
+from tasks.celery_tasks import report_progress
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def iter_id_batches(collection, query: dict):
+    """
+    Yield _id batches of matching entries in _id order.
+    
+    Pages on _id rather than skip, so entries that stop matching after an
+    update (or disappear after a delete) do not shift later pages.
+    """
+    last_id = None
+    while True:
+        page_query = query if last_id is None else {"$and": [query, {"_id": {"$gt": last_id}}]}
+        ids = [
+            doc["_id"]
+            for doc in collection.find(page_query, {"_id": 1}).sort("_id", 1).limit(settings.bulk_batch_size)
+        ]
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def run_in_batches(task, query: dict, apply_batch) -> dict:
+    collection = get_worker_db()["data_entries"]
+    total = collection.count_documents(query)
+    counts = {"matched": 0, "modified": 0, "deleted": 0}
+    for ids in iter_id_batches(collection, query):
+        for key, value in apply_batch(collection, ids).items():
+            counts[key] += value
+        report_progress(
+            task,
+            meta={
+                "current": counts["matched"],
+                "total": total,
+                "status": f"Processed {counts['matched']}/{total} entries"
+            }
+        )
+    return counts
+
+
+@celery_app.task(name="tasks.bulk_update_data_entries", bind=True)
+def bulk_update_data_entries(self, filter: dict, update: dict):
+    """
+    Apply an update to all data entries matching a filter.
+    
+    Args:
+        filter: Serialized DataEntryFilter
+        update: Fields to set
+    """
+    query = DataEntryFilter.model_validate(filter).to_query()
+    
+    def apply_batch(collection, ids):
+        result = collection.update_many(
+            {"_id": {"$in": ids}},
+            {"$set": {**update, "updated_at": datetime.utcnow()}}
+        )
+        return {"matched": result.matched_count, "modified": result.modified_count}
+    
+    counts = run_in_batches(self, query, apply_batch)
+    logger.info("Bulk update finished", extra=counts)
+    return counts
+
+
+@celery_app.task(name="tasks.bulk_delete_data_entries", bind=True)
+def bulk_delete_data_entries(self, filter: dict):
+    """
+    Delete all data entries matching a filter.
+    
+    Args:
+        filter: Serialized DataEntryFilter
+    """
+    query = DataEntryFilter.model_validate(filter).to_query()
+    
+    def apply_batch(collection, ids):
+        result = collection.delete_many({"_id": {"$in": ids}})
+        return {"matched": len(ids), "deleted": result.deleted_count}
+    
+    counts = run_in_batches(self, query, apply_batch)
+    logger.info("Bulk delete finished", extra=counts)
+    return counts
@@ -2,6 +2,7 @@
 Celery tasks for background processing.
 """
 from celery_app import celery_app
+from tracing import tracer
 import time
 import random
 from datetime import datetime
@@ -10,7 +11,14 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(name="tasks.process_data", bind=True)
+def report_progress(task, meta: dict):
+    """Record PROGRESS state unless the task was submitted fire-and-forget."""
+    if not (task.ignore_result or task.request.ignore_result):
+        with tracer.span("celery.update_state", state="PROGRESS"):
+            task.update_state(state="PROGRESS", meta=meta)
+
+
+@celery_app.task(name="tasks.process_data", bind=True, memoize=True)
 def process_data(self, data_id: str = None, processing_time: int = 5):
     """
     Process a data entry.
@@ -19,13 +27,13 @@ def process_data(self, data_id: str = None, processing_time: int = 5):
         data_id: ID of the data entry to process
         processing_time: Time to simulate processing (seconds)
     """
-    logger.info(f"Processing data entry: {data_id}")
+    logger.info("Processing data entry", extra={"data_id": data_id})
     
     # Simulate processing
     for i in range(processing_time):
         time.sleep(1)
-        self.update_state(
-            state="PROGRESS",
+        report_progress(
+            self,
             meta={
                 "current": i + 1,
                 "total": processing_time,
@@ -40,11 +48,11 @@ def process_data(self, data_id: str = None, processing_time: int = 5):
         "success": True
     }
     
-    logger.info(f"Completed processing data entry: {data_id}")
+    logger.info("Completed processing data entry", extra={"data_id": data_id})
     return result
 
 
-@celery_app.task(name="tasks.generate_report", bind=True)
+@celery_app.task(name="tasks.generate_report", bind=True, memoize=True)
 def generate_report(self, report_type: str = "summary", params: dict = None):
     """
     Generate a report.
@@ -53,7 +61,7 @@ def generate_report(self, report_type: str = "summary", params: dict = None):
         report_type: Type of report to generate (summary, detailed, analytics)
         params: Additional parameters for report generation
     """
-    logger.info(f"Generating {report_type} report")
+    logger.info("Generating report", extra={"report_type": report_type})
     
     params = params or {}
     
@@ -61,8 +69,8 @@ def generate_report(self, report_type: str = "summary", params: dict = None):
     steps = ["Collecting data", "Analyzing", "Formatting", "Finalizing"]
     for i, step in enumerate(steps):
         time.sleep(2)
-        self.update_state(
-            state="PROGRESS",
+        report_progress(
+            self,
             meta={
                 "current": i + 1,
                 "total": len(steps),
@@ -78,7 +86,7 @@ def generate_report(self, report_type: str = "summary", params: dict = None):
         "download_url": f"/reports/{report_type}_{int(time.time())}.pdf"
     }
     
-    logger.info(f"Completed generating {report_type} report")
+    logger.info("Completed generating report", extra={"report_type": report_type})
     return result
 
 
@@ -91,7 +99,7 @@ def simulate_load(self, duration: int = 10, intensity: str = "medium"):
         duration: Duration of the load test in seconds
         intensity: Intensity of the load (low, medium, high)
     """
-    logger.info(f"Starting load simulation: {intensity} intensity for {duration}s")
+    logger.info("Starting load simulation", extra={"intensity": intensity, "duration": duration})
     
     # Map intensity to operations per second
     intensity_map = {
@@ -114,8 +122,8 @@ def simulate_load(self, duration: int = 10, intensity: str = "medium"):
         time.sleep(1)
         
         elapsed = int(time.time() - start_time)
-        self.update_state(
-            state="PROGRESS",
+        report_progress(
+            self,
             meta={
                 "current": elapsed,
                 "total": duration,
@@ -132,7 +140,7 @@ def simulate_load(self, duration: int = 10, intensity: str = "medium"):
         "completed_at": datetime.utcnow().isoformat()
     }
     
-    logger.info(f"Completed load simulation: {total_operations} operations")
+    logger.info("Completed load simulation", extra={"total_operations": total_operations})
     return result
 
 
@@ -144,7 +152,7 @@ def long_running_task(self, iterations: int = 100):
     Args:
         iterations: Number of iterations to perform
     """
-    logger.info(f"Starting long-running task with {iterations} iterations")
+    logger.info("Starting long-running task", extra={"iterations": iterations})
     
     results = []
     for i in range(iterations):
@@ -154,8 +162,8 @@ def long_running_task(self, iterations: int = 100):
         
         # Update progress every 10 iterations
         if (i + 1) % 10 == 0:
-            self.update_state(
-                state="PROGRESS",
+            report_progress(
+                self,
                 meta={
                     "current": i + 1,
                     "total": iterations,
@@ -172,5 +180,25 @@ def long_running_task(self, iterations: int = 100):
         "completed_at": datetime.utcnow().isoformat()
     }
     
-    logger.info(f"Completed long-running task")
+    logger.info("Completed long-running task")
     return result
+
+
+def fire_and_forget(task):
+    """
+    Register a variant of a bound task declared with ignore_result=True.
+    
+    Celery only skips the STARTED write for tasks that ignore results at
+    declaration, not for a per-call ignore_result, so fire-and-forget
+    submissions are queued as these variants.
+    """
+    return celery_app.task(
+        name=f"{task.name}.fire_and_forget",
+        bind=True,
+        ignore_result=True
+    )(task.run.__func__)
+
+
+process_data_fire_and_forget = fire_and_forget(process_data)
+generate_report_fire_and_forget = fire_and_forget(generate_report)
+simulate_load_fire_and_forget = fire_and_forget(simulate_load)
@@ -0,0 +1,109 @@
+"""
+Scheduled maintenance tasks run by Celery beat.
+"""
+from celery_app import celery_app
+from config import settings
+from database import get_worker_db
+from models import DataEntryStatus, TaskStatus
+from pymongo import DeleteOne, ReplaceOne
+from datetime import datetime, timedelta
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "data_entries_archive"
+
+# Mongo task documents are written as pending by the API and not updated
+# afterwards, so anything past the retention window is purged unless it is
+# explicitly marked as still running.
+ACTIVE_TASK_STATES = [TaskStatus.STARTED.value, TaskStatus.PROGRESS.value, TaskStatus.RETRY.value]
+
+
+def _rate_summary(moved: int, batches: int, started: float) -> dict:
+    elapsed = time.perf_counter() - started
+    return {
+        "moved": moved,
+        "batches": batches,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(moved / elapsed, 1) if elapsed > 0 else 0.0,
+        "completed_at": datetime.utcnow().isoformat()
+    }
+
+
+@celery_app.task(name="tasks.archive_data_entries", bind=True)
+def archive_data_entries(self):
+    """
+    Move archived and stale data entries to the archive collection.
+    
+    Works in batches of archive_batch_size and stops after
+    archive_max_batches so a single run stays bounded. Copies are upserts,
+    so a run interrupted between copy and delete is safe to repeat. An
+    entry is only deleted if it is unchanged since it was copied; entries
+    updated in between stay in place and their copies are dropped.
+    """
+    db = get_worker_db()
+    source = db["data_entries"]
+    archive = db[ARCHIVE_COLLECTION]
+    cutoff = datetime.utcnow() - timedelta(days=settings.archive_after_days)
+    query = {
+        "$or": [
+            {"status": DataEntryStatus.ARCHIVED.value},
+            {"updated_at": {"$lt": cutoff}}
+        ]
+    }
+    
+    started = time.perf_counter()
+    moved = 0
+    batches = 0
+    while batches < settings.archive_max_batches:
+        docs = list(source.find(query).limit(settings.archive_batch_size))
+        if not docs:
+            break
+        now = datetime.utcnow()
+        archive.bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": now}, upsert=True) for doc in docs],
+            ordered=False
+        )
+        result = source.bulk_write(
+            [DeleteOne({**query, "_id": doc["_id"], "updated_at": doc.get("updated_at")}) for doc in docs],
+            ordered=False
+        )
+        moved += result.deleted_count
+        batches += 1
+        # Entries updated since the copy are left in place; drop their copies
+        if result.deleted_count < len(docs):
+            kept = [doc["_id"] for doc in source.find({"_id": {"$in": [doc["_id"] for doc in docs]}}, {"_id": 1})]
+            if kept:
+                archive.delete_many({"_id": {"$in": kept}})
+    
+    summary = _rate_summary(moved, batches, started)
+    logger.info("Archived data entries", extra=summary)
+    return summary
+
+
+@celery_app.task(name="tasks.purge_finished_tasks", bind=True)
+def purge_finished_tasks(self):
+    """
+    Delete task documents older than task_retention_days.
+    
+    Deletes in bounded batches like archive_data_entries.
+    """
+    db = get_worker_db()
+    tasks = db["tasks"]
+    cutoff = datetime.utcnow() - timedelta(days=settings.task_retention_days)
+    query = {"created_at": {"$lt": cutoff}, "status": {"$nin": ACTIVE_TASK_STATES}}
+    
+    started = time.perf_counter()
+    purged = 0
+    batches = 0
+    while batches < settings.archive_max_batches:
+        ids = [doc["_id"] for doc in tasks.find(query, {"_id": 1}).limit(settings.archive_batch_size)]
+        if not ids:
+            break
+        purged += tasks.delete_many({"_id": {"$in": ids}}).deleted_count
+        batches += 1
+    
+    summary = _rate_summary(purged, batches, started)
+    logger.info("Purged finished task documents", extra=summary)
+    return summary
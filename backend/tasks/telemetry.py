@@ -0,0 +1,112 @@
+"""
+Worker-side resource accounting around each task execution.
+
+Measures wall time, CPU time of the executing thread, RSS change, growth
+of the process's peak RSS and the change in allocated memory blocks for
+every task; a sampled fraction also runs under tracemalloc for the peak
+of Python allocations. Samples are aggregated per task type by
+task_telemetry and can be read with ``celery -A celery_app inspect
+task_telemetry`` or GET /api/metrics/tasks.
+"""
+from celery import signals
+from celery.worker.control import inspect_command
+from config import settings
+from task_telemetry import task_telemetry
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+import logging
+
+logger = logging.getLogger(__name__)
+
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+
+# Start measurements keyed by task id, between prerun and postrun
+_started = {}
+
+
+def current_rss_kb() -> int:
+    """Resident set size of this process; 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_KB
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def peak_rss_kb() -> int:
+    """Peak RSS of this process (the value worker_max_memory_per_child checks)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@signals.task_prerun.connect
+def start_accounting(task_id=None, task=None, **kwargs):
+    if not settings.task_telemetry_enabled:
+        return
+    traced = random.random() < settings.task_telemetry_tracemalloc_rate and not tracemalloc.is_tracing()
+    if traced:
+        tracemalloc.start()
+    _started[task_id] = (
+        time.perf_counter(),
+        time.thread_time(),
+        current_rss_kb(),
+        peak_rss_kb(),
+        sys.getallocatedblocks(),
+        traced
+    )
+
+
+@signals.task_postrun.connect
+def record_accounting(task_id=None, task=None, state=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is None:
+        return
+    wall_start, cpu_start, rss_start, peak_start, blocks_start, traced = started
+    
+    wall = time.perf_counter() - wall_start
+    cpu = time.thread_time() - cpu_start
+    rss_delta = current_rss_kb() - rss_start
+    peak = peak_rss_kb()
+    sample = {
+        "count": 1,
+        "failures": 1 if state == "FAILURE" else 0,
+        "wall_seconds": wall,
+        "wall_seconds_max": wall,
+        "cpu_seconds": cpu,
+        "cpu_seconds_max": cpu,
+        "rss_delta_kb": rss_delta,
+        "rss_delta_kb_max": rss_delta,
+        "peak_rss_growth_kb": peak - peak_start,
+        "peak_rss_growth_kb_max": peak - peak_start,
+        "allocated_blocks": sys.getallocatedblocks() - blocks_start,
+    }
+    if traced:
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sample.update({
+            "tracemalloc_samples": 1,
+            "tracemalloc_peak_kb": traced_peak / 1024,
+            "tracemalloc_peak_kb_max": traced_peak / 1024,
+        })
+    
+    # Celery replaces the pool process after this task; attribute it to the
+    # task type that crossed the limit. Peak RSS never decreases, so only the
+    # task during which it crossed counts, not every later task in the process.
+    limit = settings.worker_max_memory_per_child_kb
+    if limit and peak_start <= limit < peak:
+        sample["recycle_triggers"] = 1
+        logger.warning(
+            "Task pushed worker process over its memory limit",
+            extra={"task_name": task.name, "peak_rss_kb": peak, "limit_kb": limit}
+        )
+    
+    task_telemetry.record(task.name, sample)
+
+
+@inspect_command(name="task_telemetry")
+def task_telemetry_command(state):
+    """Per-task-type resource usage aggregated across all workers."""
+    return task_telemetry.read()
@@ -0,0 +1,236 @@
+"""
+Lightweight tracing with W3C trace context and a JSON-lines exporter.
+
+Spans are created around HTTP requests, MongoDB commands, Redis commands
+and Celery publish/execute, and linked across processes by a
+``traceparent`` header (on HTTP requests and Celery task messages).
+Finished spans are queued and appended by a background thread to
+trace_export_path, one JSON object per line, which stands in for a
+collector; loadtest/trace_summary.py summarizes such a file.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import os
+import queue
+import random
+import threading
+import time
+from config import settings
+from logging_config import request_id_var
+import logging
+
+logger = logging.getLogger(__name__)
+
+current_span_var: ContextVar = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace."""
+    
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "sampled",
+                 "start_ns", "end_ns", "attributes", "error")
+    
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: str, sampled: bool, attributes: dict):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+    
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+    
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+    
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+            "service": settings.service_type,
+            "pid": os.getpid(),
+        }
+
+
+class RemoteParent:
+    """Span context received from another process."""
+    
+    __slots__ = ("trace_id", "span_id", "sampled")
+    
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+
+def parse_traceparent(value) -> RemoteParent:
+    """Parse a W3C traceparent header; None if absent or malformed."""
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return RemoteParent(parts[1], parts[2], parts[3] == "01")
+
+
+class Tracer:
+    """Creates spans and exports the sampled ones from a background thread."""
+    
+    def __init__(self):
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return settings.tracing_enabled
+    
+    def start_span(self, name: str, kind: str = "internal", parent=None, attributes: dict = None) -> Span:
+        """
+        Start a span under parent (default: the current span). A span
+        without a parent starts a new trace, sampled at trace_sample_rate.
+        """
+        if parent is None:
+            parent = current_span_var.get()
+        if parent is None:
+            trace_id = os.urandom(16).hex()
+            parent_id = None
+            sampled = random.random() < settings.trace_sample_rate
+        else:
+            trace_id = parent.trace_id
+            parent_id = parent.span_id
+            sampled = parent.sampled
+        return Span(name, kind, trace_id, parent_id, sampled, attributes or {})
+    
+    def end_span(self, span: Span, error: BaseException = None, end_ns: int = None):
+        span.end_ns = end_ns or time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        if span.sampled:
+            self._export(span)
+    
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", parent=None, **attributes):
+        """Run a block in a span that is current for nested spans; yields None when disabled."""
+        if not self.enabled:
+            yield None
+            return
+        span = self.start_span(name, kind, parent, attributes)
+        token = current_span_var.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, error=e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            current_span_var.reset(token)
+    
+    def _export(self, span: Span):
+        if self._pid != os.getpid():
+            self._start_exporter()
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+    
+    def _start_exporter(self):
+        # Also runs in forked children, which do not inherit the thread
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(settings.trace_queue_size)
+            self._thread = threading.Thread(target=self._write_spans, args=(self._queue,), daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+    
+    def _write_spans(self, span_queue: queue.Queue):
+        while True:
+            batch = [span_queue.get()]
+            while len(batch) < 500:
+                try:
+                    batch.append(span_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                batch = [s for s in batch if s is not None]
+                stop = True
+            else:
+                stop = False
+            try:
+                with open(settings.trace_export_path, "a") as f:
+                    f.writelines(json.dumps(s, default=str) + "\n" for s in batch)
+            except OSError as e:
+                logger.warning(f"Failed to export {len(batch)} spans: {e}")
+            if stop:
+                return
+    
+    def flush(self):
+        """Write out queued spans and stop the exporter thread of this process."""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._pid = None
+
+
+# Global tracer instance
+tracer = Tracer()
+
+
+class TracingMiddleware:
+    """ASGI middleware that records a server span per HTTP request."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+        
+        parent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                parent = parse_traceparent(value)
+                break
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        with tracer.span(f"{scope['method']} {scope['path']}", kind="server", parent=parent) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # Name the span after the route template once routing is done
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{scope['method']} {route.path}"
+                    span.set_attribute("http.route", route.path)
+                span.set_attribute("http.method", scope["method"])
+                span.set_attribute("http.path", scope["path"])
+                span.set_attribute("http.status_code", status_code)
+                span.set_attribute("request_id", request_id_var.get())
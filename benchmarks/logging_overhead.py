@@ -0,0 +1,124 @@
+"""
+Measure per-request logging overhead of the backend.
+
+Drives a cheap route of the in-process app (see run.py) once per logging
+setup and reports latency and the overhead over running without logs:
+
+    off            access log disabled, root logger at WARNING
+    sync           plain StreamHandler writing text on the request path
+                   (the previous logging.basicConfig setup)
+    queue          logging_config.setup_logging: JSON via a queue listener
+    queue-sampled  as queue, with the route's access log sampled
+
+Output goes to a stream whose writes take --write-latency-ms, standing in
+for a container stdout pipe under pressure.
+
+    python benchmarks/logging_overhead.py --requests 2000 --write-latency-ms 0.2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+
+import stand_ins
+
+import httpx
+
+from config import settings
+from run import summarize
+
+MODES = ["off", "sync", "queue", "queue-sampled"]
+ROUTE = "/api/metrics/pools"
+
+
+class SlowStream:
+    """Text stream whose writes block for a fixed time."""
+    
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.lines = 0
+    
+    def write(self, text: str):
+        time.sleep(self.latency_s)
+        self.lines += text.count("\n")
+    
+    def flush(self):
+        pass
+
+
+def configure(mode: str, stream: SlowStream):
+    import logging_config
+    
+    logging_config.shutdown_logging()
+    settings.log_access = mode != "off"
+    settings.log_sample_paths = ROUTE if mode == "queue-sampled" else ""
+    root = logging.getLogger()
+    if mode == "off":
+        root.setLevel(logging.WARNING)
+    elif mode == "sync":
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(logging_config.TEXT_FORMAT))
+        root.handlers = [handler]
+        root.setLevel(logging.INFO)
+    else:
+        logging_config.setup_logging(stream=stream)
+        root.setLevel(logging.INFO)
+    # Client-side request logs would be measured as server overhead
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+async def run_mode(app, requests: int) -> dict:
+    latencies = []
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get(ROUTE)
+        started = time.perf_counter()
+        for _ in range(requests):
+            t = time.perf_counter()
+            response = await client.get(ROUTE)
+            latencies.append((time.perf_counter() - t) * 1000)
+            if response.status_code >= 400:
+                failures += 1
+    return summarize(latencies, failures, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--write-latency-ms", type=float, default=0.2)
+    parser.add_argument("--sample-rate", type=float, default=0.01)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    stand_ins.install()
+    settings.log_sample_rate = args.sample_rate
+    from main import app
+    import logging_config
+    
+    results = {}
+    for mode in MODES:
+        stream = SlowStream(args.write_latency_ms / 1000)
+        configure(mode, stream)
+        results[mode] = asyncio.run(run_mode(app, args.requests))
+        # Let the listener drain so the next mode starts from an empty queue
+        logging_config.shutdown_logging()
+        results[mode]["lines_written"] = stream.lines
+    
+    base = results["off"]["mean_ms"]
+    print(f"{'mode':<14} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'overhead us/req':>16} {'lines':>7}")
+    for mode, r in results.items():
+        r["overhead_us"] = round((r["mean_ms"] - base) * 1000, 1)
+        print(f"{mode:<14} {r['mean_ms']:>8.3f} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} "
+              f"{r['overhead_us']:>16.1f} {r['lines_written']:>7}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
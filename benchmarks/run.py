@@ -0,0 +1,304 @@
+"""
+Benchmark the API routes and Celery tasks against in-memory stand-ins.
+
+Drives the FastAPI app from backend/main.py in-process (no lifespan, no
+servers) and runs each task in backend/tasks/celery_tasks.py inline with a
+virtual clock, recording throughput and latency percentiles. Results are
+written as JSON and compared against a baseline to flag regressions.
+
+    python benchmarks/run.py                      # run and compare with baseline.json
+    python benchmarks/run.py --save-baseline      # run and store as the new baseline
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from unittest import mock
+
+import stand_ins
+
+import httpx
+
+from config import settings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# Metrics where a higher value is a regression, and those where lower is
+LATENCY_METRICS = ["p50_ms", "p95_ms", "p99_ms"]
+THROUGHPUT_METRICS = ["rps"]
+
+
+def percentile(sorted_samples: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+def summarize(latencies_ms: list, failures: int, elapsed_s: float) -> dict:
+    samples = sorted(latencies_ms)
+    return {
+        "requests": len(samples),
+        "failures": failures,
+        "rps": round(len(samples) / elapsed_s, 1) if elapsed_s else 0.0,
+        "mean_ms": round(sum(samples) / len(samples), 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+
+# Route scenarios
+
+def data_payload() -> dict:
+    return {
+        "name": f"bench-{random.randint(1000, 9999)}",
+        "description": "Benchmark entry",
+        "value": random.uniform(1, 1000),
+        "status": random.choice(["active", "inactive"])
+    }
+
+
+# Entries selected per bulk update/delete request
+BULK_IDS = 10
+
+
+def route_scenarios(ids: list, task_ids: list) -> list:
+    """(name, method, path factory, body factory, request cap) per route."""
+    return [
+        # The health check waits on a Celery broadcast reply (1s timeout),
+        # so it gets a small request budget
+        ("GET /api/health", "GET", lambda: "/api/health", None, 10),
+        ("GET /api/metrics", "GET", lambda: "/api/metrics", None, None),
+        ("GET /api/metrics/pools", "GET", lambda: "/api/metrics/pools", None, None),
+        ("GET /api/metrics/tasks", "GET", lambda: "/api/metrics/tasks", None, None),
+        ("GET /api/data", "GET", lambda: f"/api/data?skip={random.randint(0, 20)}&limit=10", None, None),
+        ("GET /api/data [filtered]", "GET",
+         lambda: f"/api/data?status={random.choice(['active', 'inactive'])}&limit=10", None, None),
+        # $text search is not available in the stand-in, name_prefix is
+        ("GET /api/data [name_prefix]", "GET",
+         lambda: f"/api/data?name_prefix=bench-{random.randint(1, 9)}&limit=10", None, None),
+        ("POST /api/data", "POST", lambda: "/api/data", data_payload, None),
+        ("GET /api/data/{id}", "GET", lambda: f"/api/data/{random.choice(ids)}", None, None),
+        ("PUT /api/data/{id}", "PUT", lambda: f"/api/data/{random.choice(ids)}",
+         lambda: {"value": random.uniform(1, 1000)}, None),
+        # Unique params so every submission is enqueued rather than memoized
+        ("POST /api/tasks", "POST", lambda: "/api/tasks",
+         lambda: {"task_type": "process_data", "params": {"processing_time": 1, "data_id": uuid.uuid4().hex}}, None),
+        ("POST /api/tasks [memoized]", "POST", lambda: "/api/tasks",
+         lambda: {"task_type": "generate_report", "params": {"report_type": "summary"}}, None),
+        ("GET /api/tasks/{id}", "GET", lambda: f"/api/tasks/{random.choice(task_ids)}", None, None),
+        ("PATCH /api/data [ids]", "PATCH", lambda: "/api/data",
+         lambda: {"ids": random.sample(ids, BULK_IDS), "update": {"value": random.uniform(1, 1000)}}, None),
+        ("PATCH /api/data [filter]", "PATCH", lambda: "/api/data",
+         lambda: {"filter": {"status": "inactive", "value_min": 990}, "update": {"value": 995}}, None),
+        # Bulk deletes use up half of the seeded entries, single deletes the rest
+        ("DELETE /api/data [ids]", "DELETE", lambda: "/api/data",
+         lambda: {"ids": [ids.pop() for _ in range(BULK_IDS)]}, len(ids) // (2 * BULK_IDS)),
+        ("DELETE /api/data/{id}", "DELETE", lambda: f"/api/data/{ids.pop()}", None, None),
+    ]
+
+
+async def run_route(client: httpx.AsyncClient, method: str, path, body, requests: int, concurrency: int) -> dict:
+    latencies = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, path(), json=body() if body else None)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                failures += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return summarize(latencies, failures, time.perf_counter() - started)
+
+
+async def bench_routes(requests: int, concurrency: int, seed_entries: int) -> dict:
+    from main import app
+    
+    # main configures INFO logging; per-request and per-task log lines would
+    # dominate the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        ids = []
+        for _ in range(seed_entries):
+            response = await client.post("/api/data", json=data_payload())
+            ids.append(response.json()["_id"])
+        task_ids = []
+        for _ in range(20):
+            response = await client.post("/api/tasks", json={"task_type": "process_data"})
+            task_ids.append(response.json()["task_id"])
+        
+        results = {}
+        for name, method, path, body, cap in route_scenarios(ids, task_ids):
+            n = min(requests, cap) if cap else requests
+            if method == "DELETE":
+                n = min(n, len(ids) - 1)
+            results[name] = await run_route(client, method, path, body, n, concurrency)
+            print(f"  {name:<28} {results[name]['rps']:>9.1f} req/s  p95 {results[name]['p95_ms']:.2f} ms")
+    return results
+
+
+# Task scenarios
+
+class VirtualClock:
+    """Stand-in for the time module whose sleep() advances a virtual offset."""
+    
+    def __init__(self):
+        self.offset = 0.0
+    
+    def time(self) -> float:
+        return time.time() + self.offset
+    
+    def sleep(self, seconds: float):
+        self.offset += seconds
+
+
+TASK_SCENARIOS = [
+    ("tasks.process_data", "process_data", {"processing_time": 5}),
+    ("tasks.generate_report", "generate_report", {"report_type": "summary"}),
+    ("tasks.simulate_load", "simulate_load", {"duration": 3, "intensity": "high"}),
+    ("tasks.long_running_task", "long_running_task", {"iterations": 100}),
+]
+
+
+def bench_tasks(runs: int) -> dict:
+    from tasks import celery_tasks
+    
+    results = {}
+    for name, attr, kwargs in TASK_SCENARIOS:
+        task = getattr(celery_tasks, attr)
+        latencies = []
+        failures = 0
+        started = time.perf_counter()
+        with mock.patch.object(celery_tasks, "time", VirtualClock()):
+            for _ in range(runs):
+                t = time.perf_counter()
+                result = task.apply(kwargs=kwargs)
+                latencies.append((time.perf_counter() - t) * 1000)
+                if not result.successful():
+                    failures += 1
+        results[name] = summarize(latencies, failures, time.perf_counter() - started)
+        print(f"  {name:<28} {results[name]['rps']:>9.1f} runs/s   p95 {results[name]['p95_ms']:.2f} ms")
+    return results
+
+
+# Baseline comparison
+
+def compare(current: dict, baseline: dict, threshold_pct: float) -> list:
+    """Return a list of regression descriptions."""
+    regressions = []
+    for group in ("routes", "tasks"):
+        for name, metrics in current.get(group, {}).items():
+            base = baseline.get(group, {}).get(name)
+            if not base:
+                continue
+            for metric in LATENCY_METRICS:
+                if base[metric] and metrics[metric] > base[metric] * (1 + threshold_pct / 100):
+                    regressions.append(
+                        f"{name}: {metric} {base[metric]:.2f} -> {metrics[metric]:.2f}"
+                    )
+            for metric in THROUGHPUT_METRICS:
+                if base[metric] and metrics[metric] < base[metric] * (1 - threshold_pct / 100):
+                    regressions.append(
+                        f"{name}: {metric} {base[metric]:.1f} -> {metrics[metric]:.1f}"
+                    )
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--task-runs", type=int, default=20, help="Executions per task")
+    parser.add_argument("--seed-entries", type=int, default=600)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="Allowed regression in percent before failing")
+    parser.add_argument("--output", help="Result file (default: results/<timestamp>.json)")
+    args = parser.parse_args()
+    
+    random.seed(42)
+    stand_ins.install()
+    # Rate limiting would turn the submission benchmark into a 429 benchmark
+    settings.rate_limit_enabled = False
+    
+    print("Routes:")
+    routes = asyncio.run(bench_routes(args.requests, args.concurrency, args.seed_entries))
+    print("Tasks:")
+    tasks = bench_tasks(args.task_runs)
+    
+    result = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "task_runs": args.task_runs,
+        },
+        "routes": routes,
+        "tasks": tasks,
+    }
+    
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {output}")
+    
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save-baseline to create one")
+        return 0
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(result, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0f}% vs baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions over {args.threshold:.0f}% vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+In-memory stand-ins for MongoDB, Redis and the Celery broker.
+
+install() points the backend's global connection managers at mongomock and
+fakeredis and switches Celery to the in-memory kombu transport, so the
+FastAPI app and the Celery tasks run in-process without any servers.
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import fakeredis
+import mongomock
+import redis
+
+import redis_client as redis_module
+from config import settings
+from database import mongodb
+from redis_client import InstrumentedConnectionPool, redis_client
+from tasks import get_celery_app
+
+
+def _fake_pool(server: fakeredis.FakeServer, decode_responses: bool) -> InstrumentedConnectionPool:
+    return InstrumentedConnectionPool(
+        connection_class=fakeredis.FakeConnection,
+        server=server,
+        decode_responses=decode_responses,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout,
+    )
+
+
+def install(eager: bool = False):
+    """
+    Replace external services with in-memory fakes.
+    
+    With eager=True Celery runs tasks inline on submission; otherwise they are
+    published to the in-memory broker and never executed.
+    """
+    # MongoDB
+    mongodb.client = mongomock.MongoClient()
+    mongodb.db = mongodb.client[settings.mongodb_database]
+    
+    # Redis: register fake pools for every URL the backend resolves, so the
+    # instrumented pool code stays on the request path
+    server = fakeredis.FakeServer()
+    with redis_module._pools_lock:
+        redis_module._pools.clear()
+        for url in {settings.redis_url, settings.celery_broker_url}:
+            redis_module._pools[(url, True)] = _fake_pool(server, True)
+        redis_module._pools[(settings.celery_result_backend, False)] = _fake_pool(server, False)
+    redis_client.client = redis.Redis(
+        connection_pool=redis_module.get_connection_pool(settings.redis_url)
+    )
+    
+    # Celery
+    celery_app = get_celery_app()
+    celery_app.conf.broker_url = "memory://localhost/"
+    celery_app.conf.task_always_eager = eager
+    celery_app.conf.task_store_eager_result = eager
+    return server
+
+
+def reset():
+    """Drop all data held by the fakes."""
+    if mongodb.client is not None:
+        mongodb.client.drop_database(settings.mongodb_database)
+    if redis_client.client is not None:
+        redis_client.client.flushall()
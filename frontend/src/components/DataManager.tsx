@@ -1,5 +1,11 @@
-import { useState } from 'react';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useEffect, useState } from 'react';
+import { isAxiosError } from 'axios';
+import {
+  useQuery,
+  useMutation,
+  useQueryClient,
+  keepPreviousData,
+} from '@tanstack/react-query';
 import {
   Box,
   Button,
@@ -36,7 +42,28 @@ import {
   updateDataEntry,
   deleteDataEntry,
 } from '../services/api';
-import type { DataEntry, DataEntryCreate, DataEntryUpdate } from '../types/api';
+import type {
+  DataEntry,
+  DataEntryCreate,
+  DataEntryUpdate,
+  DataEntryQuery,
+} from '../types/api';
+
+// Filters are only sent once typing pauses for this long
+const SEARCH_DEBOUNCE_MS = 300;
+const BUSY_MAX_RETRIES = 5;
+
+// 503 means the API shed the query under load and it should be retried later
+const isServerBusy = (error: unknown) =>
+  isAxiosError(error) && error.response?.status === 503;
+
+// Wait for the Retry-After the API sent, else back off exponentially
+const retryDelay = (attempt: number, error: unknown) => {
+  const retryAfter = isAxiosError(error)
+    ? Number(error.response?.headers['retry-after'])
+    : NaN;
+  return retryAfter > 0 ? retryAfter * 1000 : Math.min(1000 * 2 ** attempt, 30000);
+};
 
 export default function DataManager() {
   const queryClient = useQueryClient();
@@ -49,10 +76,30 @@ export default function DataManager() {
     status: 'active',
   });
 
-  const { data: entries, isLoading, error } = useQuery({
-    queryKey: ['dataEntries'],
-    queryFn: () => listDataEntries(),
+  const [search, setSearch] = useState('');
+  const [debouncedSearch, setDebouncedSearch] = useState('');
+  const [statusFilter, setStatusFilter] = useState<DataEntryQuery['status'] | ''>('');
+
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(search.trim()), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [search]);
+
+  const query: DataEntryQuery = {
+    ...(debouncedSearch && { search: debouncedSearch }),
+    ...(statusFilter && { status: statusFilter }),
+  };
+
+  const { data: entries, isLoading, error, failureReason, refetch } = useQuery({
+    queryKey: ['dataEntries', query],
+    queryFn: () => listDataEntries(0, 100, query),
+    // Keep showing the current rows while a new filter loads
+    placeholderData: keepPreviousData,
+    retry: (failureCount, error) =>
+      failureCount < (isServerBusy(error) ? BUSY_MAX_RETRIES : 1),
+    retryDelay,
   });
+  const serverBusy = isServerBusy(error ?? failureReason);
 
   const createMutation = useMutation({
     mutationFn: createDataEntry,
@@ -117,7 +164,7 @@ export default function DataManager() {
     );
   }
 
-  if (error) {
+  if (error && !serverBusy) {
     return <Alert severity="error">Failed to load data entries</Alert>;
   }
 
@@ -134,6 +181,49 @@ export default function DataManager() {
         </Button>
       </Box>
 
+      <Box display="flex" gap={2} mb={2}>
+        <TextField
+          label="Search"
+          size="small"
+          value={search}
+          onChange={(e) => setSearch(e.target.value)}
+          sx={{ flexGrow: 1 }}
+        />
+        <FormControl size="small" sx={{ minWidth: 160 }}>
+          <InputLabel>Status</InputLabel>
+          <Select
+            value={statusFilter}
+            label="Status"
+            onChange={(e) =>
+              setStatusFilter(e.target.value as DataEntryQuery['status'] | '')
+            }
+          >
+            <MenuItem value="">All</MenuItem>
+            <MenuItem value="active">Active</MenuItem>
+            <MenuItem value="inactive">Inactive</MenuItem>
+            <MenuItem value="archived">Archived</MenuItem>
+          </Select>
+        </FormControl>
+      </Box>
+
+      {serverBusy && (
+        <Alert
+          severity="warning"
+          sx={{ mb: 2 }}
+          action={
+            error ? (
+              <Button color="inherit" size="small" onClick={() => refetch()}>
+                Retry
+              </Button>
+            ) : undefined
+          }
+        >
+          {error
+            ? 'The server is busy. Narrow the filter or try again later.'
+            : 'The server is busy, retrying shortly...'}
+        </Alert>
+      )}
+
       <TableContainer component={Paper}>
         <Table>
           <TableHead>
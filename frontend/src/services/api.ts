@@ -7,6 +7,7 @@ import {
   DataEntry,
   DataEntryCreate,
   DataEntryUpdate,
+  DataEntryQuery,
   TaskCreate,
   TaskResponse,
   HealthCheck,
@@ -48,10 +49,11 @@ export const getTaskStatus = async (taskId: string): Promise<TaskResponse> => {
 
 export const listDataEntries = async (
   skip = 0,
-  limit = 100
+  limit = 100,
+  query: DataEntryQuery = {}
 ): Promise<DataEntry[]> => {
   const { data } = await api.get<DataEntry[]>('/data', {
-    params: { skip, limit },
+    params: { skip, limit, ...query },
   });
   return data;
 };
@@ -28,6 +28,16 @@ export interface DataEntryUpdate {
   status?: 'active' | 'inactive' | 'archived';
 }
 
+export interface DataEntryQuery {
+  status?: 'active' | 'inactive' | 'archived';
+  value_min?: number;
+  value_max?: number;
+  created_after?: string;
+  created_before?: string;
+  name_prefix?: string;
+  search?: string;
+}
+
 export interface TaskCreate {
   task_type: string;
   params?: Record<string, any>;
@@ -40,6 +50,8 @@ export interface TaskResponse {
   created_at: string;
   result?: any;
   error?: string;
+  progress?: { current: number; total: number; status: string; [key: string]: unknown } | null;
+  memoized?: boolean;
 }
 
 export interface HealthCheck {
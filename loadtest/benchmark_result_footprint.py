@@ -0,0 +1,112 @@
+"""
+Measure Redis result-backend memory per 100k tasks.
+
+Stores synthetic results shaped like the ones returned by
+backend/tasks/celery_tasks.py through the application's result backend
+(SharedPoolRedisBackend), once per serializer/compression variant, and
+reports the growth of Redis used_memory scaled to 100k tasks alongside the
+average task message size. Results are compressed from --min-bytes on, as
+CELERY_RESULT_COMPRESSION_MIN_BYTES does in the application.
+
+Uses a scratch database that is flushed before every variant:
+    python loadtest/benchmark_result_footprint.py --redis-url redis://localhost:6379/15
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+import redis
+from celery import Celery
+from kombu import compression
+from kombu.serialization import dumps
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from config import settings  # noqa: E402
+
+VARIANTS = [
+    ("json", None),
+    ("json", "zlib"),
+    ("msgpack", None),
+    ("msgpack", "zlib"),
+]
+
+
+def sample_result() -> dict:
+    """A result resembling one of the task return values."""
+    kind = random.choice(["process_data", "generate_report", "simulate_load"])
+    now = datetime.utcnow().isoformat()
+    if kind == "process_data":
+        return {"data_id": uuid.uuid4().hex[:24], "processed_at": now,
+                "items_processed": random.randint(100, 1000), "success": True}
+    if kind == "generate_report":
+        return {"report_type": "summary", "generated_at": now,
+                "pages": random.randint(5, 50), "file_size_kb": random.randint(100, 5000),
+                "download_url": f"/reports/summary_{int(time.time())}.pdf"}
+    return {"duration": 10, "intensity": "medium", "total_operations": 500,
+            "ops_per_second": 50.0, "completed_at": now}
+
+
+def message_size(serializer: str, codec) -> float:
+    """Average bytes of a serialized task message body."""
+    total = 0
+    for _ in range(1000):
+        body = ((), {"report_type": "summary", "params": {"iterations": 50}}, {})
+        _, _, data = dumps(body, serializer=serializer)
+        if codec:
+            data, _ = compression.compress(data, codec)
+        total += len(data)
+    return total / 1000
+
+
+def measure(url: str, serializer: str, codec, tasks: int) -> dict:
+    app = Celery("footprint", backend=f"celery_app:SharedPoolRedisBackend+{url}")
+    app.conf.update(
+        result_serializer=serializer,
+        result_accept_content=["json", "msgpack"],
+        result_compression=codec,
+        result_expires=3600,
+    )
+    client = redis.from_url(url)
+    client.flushdb()
+    before = client.info("memory")["used_memory"]
+    backend = app.backend
+    for _ in range(tasks):
+        backend.store_result(uuid.uuid4().hex, sample_result(), "SUCCESS")
+    after = client.info("memory")["used_memory"]
+    client.flushdb()
+    return {
+        "serializer": serializer,
+        "compression": codec or "none",
+        "bytes_per_100k_tasks": int((after - before) * 100_000 / tasks),
+        "avg_message_bytes": round(message_size(serializer, codec), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--min-bytes", type=int, default=0,
+                        help="Smallest result compressed (default: every result)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    settings.celery_result_compression_min_bytes = args.min_bytes
+    
+    results = [measure(args.redis_url, s, c, args.tasks) for s, c in VARIANTS]
+    print(f"{'serializer':<10} {'compression':<12} {'MiB/100k':>9} {'msg bytes':>10}")
+    for r in results:
+        print(f"{r['serializer']:<10} {r['compression']:<12} "
+              f"{r['bytes_per_100k_tasks'] / 2**20:>9.1f} {r['avg_message_bytes']:>10.1f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Compare single-process vs multi-process backend throughput.
+
+Restarts the docker-compose backend in each SERVER_MODE, runs the Locust
+scenarios from locustfile.py headless against it and prints the aggregated
+requests/s and latency percentiles side by side.
+
+Run from the repository root with the compose stack already up:
+    python loadtest/benchmark_server_modes.py --users 100 --run-time 2m
+"""
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+LOADTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+MODES = ["single", "multi"]
+
+
+def restart_backend(mode: str, web_concurrency: int):
+    """Recreate the backend container in the given server mode."""
+    env = {
+        **os.environ,
+        "SERVER_MODE": mode,
+        "WEB_CONCURRENCY": str(web_concurrency),
+    }
+    subprocess.run(
+        ["docker", "compose", "up", "-d", "--no-deps", "--force-recreate", "backend"],
+        env=env,
+        check=True,
+    )
+
+
+def wait_healthy(host: str, timeout: int = 120):
+    """Poll /api/health until the backend answers."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{host}/api/health", timeout=5) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(1)
+    raise TimeoutError(f"Backend at {host} did not become healthy in {timeout}s")
+
+
+def run_locust(host: str, users: int, spawn_rate: int, run_time: str, prefix: str) -> dict:
+    """Run Locust headless and return the aggregated stats row."""
+    subprocess.run(
+        [
+            "locust", "-f", os.path.join(LOADTEST_DIR, "locustfile.py"),
+            "--host", host,
+            "--users", str(users),
+            "--spawn-rate", str(spawn_rate),
+            "--run-time", run_time,
+            "--headless",
+            "--only-summary",
+            "--csv", prefix,
+            "--exit-code-on-error", "0",
+        ],
+        check=True,
+    )
+    with open(f"{prefix}_stats.csv", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["Name"] == "Aggregated":
+                return {
+                    "requests": int(row["Request Count"]),
+                    "failures": int(row["Failure Count"]),
+                    "rps": float(row["Requests/s"]),
+                    "p50_ms": float(row["50%"]),
+                    "p95_ms": float(row["95%"]),
+                    "p99_ms": float(row["99%"]),
+                }
+    raise RuntimeError(f"No aggregated row in {prefix}_stats.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--spawn-rate", type=int, default=10)
+    parser.add_argument("--run-time", default="1m")
+    parser.add_argument("--web-concurrency", type=int, default=0,
+                        help="Worker processes for multi mode (0 = auto)")
+    parser.add_argument("--output", default="server_modes.json")
+    args = parser.parse_args()
+    
+    results = {}
+    for mode in MODES:
+        print(f"==> Benchmarking SERVER_MODE={mode}")
+        restart_backend(mode, args.web_concurrency)
+        wait_healthy(args.host)
+        results[mode] = run_locust(
+            args.host, args.users, args.spawn_rate, args.run_time,
+            prefix=f"server_mode_{mode}",
+        )
+    
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    
+    print(f"\n{'mode':<8} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'fail%':>7}")
+    for mode, r in results.items():
+        fail_pct = 100 * r["failures"] / r["requests"] if r["requests"] else 0.0
+        print(f"{mode:<8} {r['rps']:>9.1f} {r['p50_ms']:>8.0f} {r['p95_ms']:>8.0f} "
+              f"{r['p99_ms']:>8.0f} {fail_pct:>6.2f}%")
+    single, multi = results["single"]["rps"], results["multi"]["rps"]
+    if single:
+        print(f"\nThroughput speedup (multi / single): {multi / single:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
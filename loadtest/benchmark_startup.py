@@ -0,0 +1,93 @@
+"""
+Measure backend cold-start time.
+
+Reports, over several fresh interpreters, how long importing the FastAPI
+app takes and - with --serve - how long a uvicorn process takes until
+/api/health answers (requires MongoDB and Redis to be reachable with the
+usual environment variables).
+
+Run from the repository root:
+    python loadtest/benchmark_startup.py --runs 5 --serve
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import main; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def measure_import() -> float:
+    """Milliseconds to import main in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_ready(port: int, timeout: float) -> float:
+    """Milliseconds from spawning uvicorn until /api/health returns 200."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=2) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                pass
+            if proc.poll() is not None:
+                raise RuntimeError("uvicorn exited before becoming ready")
+            time.sleep(0.05)
+        raise TimeoutError(f"Backend not ready within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def summarize(samples: list) -> dict:
+    return {
+        "runs": len(samples),
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--serve", action="store_true", help="Also measure time to readiness")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    results = {"import": summarize([measure_import() for _ in range(args.runs)])}
+    if args.serve:
+        results["ready"] = summarize([measure_ready(args.port, args.timeout) for _ in range(args.runs)])
+    
+    for name, r in results.items():
+        print(f"{name:<8} median {r['median_ms']:>8.1f} ms  (min {r['min_ms']:.1f}, max {r['max_ms']:.1f}, n={r['runs']})")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,53 @@
 """
 Locust load test scenarios for LoadTest Demo Application
 Run with: locust -f locustfile.py --host=http://loadtest-{branch}.local
+
+Optional load shape (overrides --users/--spawn-rate/--run-time):
+    LOAD_SHAPE=ramp|spike|soak SHAPE_PEAK_USERS=200 SHAPE_DURATION=600 locust -f locustfile.py ...
 """
 
-from locust import HttpUser, task, between
+from locust import HttpUser, LoadTestShape, task, between
+import os
 import random
-import json
+import time
+import uuid
+
+
+# Task payloads matching the task map in backend/tasks/__init__.py
+TASK_PAYLOADS = {
+    "process_data": lambda: {
+        "data_id": uuid.uuid4().hex[:24],
+        "processing_time": random.randint(1, 5)
+    },
+    "generate_report": lambda: {
+        "report_type": random.choice(["summary", "detailed", "analytics"])
+    },
+    "simulate_load": lambda: {
+        "duration": random.randint(1, 5),
+        "intensity": random.choice(["low", "medium", "high"])
+    },
+}
+
+TASK_POLL_INTERVAL = float(os.getenv("TASK_POLL_INTERVAL", "1.0"))
+TASK_TIMEOUT = float(os.getenv("TASK_TIMEOUT", "120"))
+FINISHED_STATES = {"success", "failure"}
+
+
+def random_task() -> dict:
+    """Build a valid task submission."""
+    task_type = random.choice(list(TASK_PAYLOADS))
+    return {"task_type": task_type, "params": TASK_PAYLOADS[task_type]()}
 
 
 class LoadTestUser(HttpUser):
     """Simulates a user interacting with the LoadTest application."""
     
+    weight = 6
     wait_time = between(1, 3)  # Wait 1-3 seconds between tasks
     
     def on_start(self):
         """Called when a simulated user starts."""
+        self.created_ids = []
         # Check if backend is healthy before starting
         response = self.client.get("/api/health")
         if response.status_code != 200:
@@ -44,13 +77,9 @@ class LoadTestUser(HttpUser):
             json=payload,
             name="/api/data [POST]"
         )
-        if response.status_code == 200:
+        if response.status_code == 201:
             # Store the ID for potential updates/deletes
-            data = response.json()
-            if hasattr(self, 'created_ids'):
-                self.created_ids.append(data.get('_id'))
-            else:
-                self.created_ids = [data.get('_id')]
+            self.created_ids.append(response.json()["_id"])
     
     @task(4)
     def list_data_entries(self):
@@ -65,52 +94,64 @@ class LoadTestUser(HttpUser):
             name="/api/data [GET]"
         )
     
+    @task(2)
+    def search_data_entries(self):
+        """List data entries with an indexed filter."""
+        params = random.choice([
+            {"status": random.choice(["active", "inactive"])},
+            {"name_prefix": f"test-entry-{random.randint(1, 9)}"},
+            {"value_min": random.randint(1, 900), "value_max": 1000},
+            {"search": "generated"},
+        ])
+        self.client.get(
+            "/api/data",
+            params={**params, "limit": 10},
+            name="/api/data [GET filtered]"
+        )
+    
     @task(1)
     def create_task(self):
         """Create a Celery task."""
-        task_types = ["heavy_compute", "data_processing", "report_generation"]
-        payload = {
-            "task_type": random.choice(task_types),
-            "params": {
-                "iterations": random.randint(10, 100),
-                "delay": random.uniform(0.1, 1.0)
-            }
-        }
         response = self.client.post(
             "/api/tasks",
-            json=payload,
+            json=random_task(),
             name="/api/tasks [POST]"
         )
-        if response.status_code == 200:
-            data = response.json()
-            task_id = data.get('task_id')
+        # 200 is a memoized submission attached to an existing execution
+        if response.status_code in (200, 201):
+            task_id = response.json()["task_id"]
             # Check task status
-            if task_id:
-                self.client.get(
-                    f"/api/tasks/{task_id}",
-                    name="/api/tasks/{id} [GET]"
-                )
+            self.client.get(
+                f"/api/tasks/{task_id}",
+                name="/api/tasks/{id} [GET]"
+            )
     
     @task(1)
     def update_data_entry(self):
         """Update an existing data entry if we have created any."""
-        if hasattr(self, 'created_ids') and self.created_ids:
-            entry_id = random.choice(self.created_ids)
-            payload = {
-                "value": random.randint(1, 1000),
-                "status": random.choice(["active", "inactive", "archived"])
-            }
-            self.client.put(
-                f"/api/data/{entry_id}",
-                json=payload,
-                name="/api/data/{id} [PUT]",
-                catch_response=True
-            )
+        if not self.created_ids:
+            return
+        entry_id = random.choice(self.created_ids)
+        payload = {
+            "value": random.randint(1, 1000),
+            "status": random.choice(["active", "inactive", "archived"])
+        }
+        with self.client.put(
+            f"/api/data/{entry_id}",
+            json=payload,
+            name="/api/data/{id} [PUT]",
+            catch_response=True
+        ) as response:
+            if response.status_code == 404:
+                # Entry removed by another user or a maintenance job
+                self.created_ids.remove(entry_id)
+                response.success()
 
 
 class HighLoadUser(HttpUser):
     """Simulates high-load user with more aggressive patterns."""
     
+    weight = 3
     wait_time = between(0.1, 0.5)  # Faster interactions
     
     @task(10)
@@ -130,9 +171,112 @@ class HighLoadUser(HttpUser):
     
     @task(3)
     def rapid_task_creation(self):
-        """Create tasks rapidly."""
+        """Create short fire-and-forget tasks rapidly."""
         payload = {
-            "task_type": "heavy_compute",
-            "params": {"iterations": 5}
+            "task_type": "simulate_load",
+            "params": {"duration": 1, "intensity": "low"},
+            "ignore_result": True
         }
         self.client.post("/api/tasks", json=payload, name="[HighLoad] /api/tasks [POST]")
+
+
+class TaskLifecycleUser(HttpUser):
+    """
+    Closed-loop user: submits a task and follows it until it finishes.
+    
+    Reports two custom metrics (request type TASK) per task type:
+    "queue wait" until a worker picks the task up, and "end-to-end" until
+    it completes. Both are measured at TASK_POLL_INTERVAL granularity.
+    Memoized submissions join an execution that may already be running or
+    done, so they only report "end-to-end ... [memoized]".
+    """
+    
+    weight = 1
+    wait_time = between(1, 2)
+    
+    def _report(self, name: str, started: float, exception: Exception = None):
+        self.environment.events.request.fire(
+            request_type="TASK",
+            name=name,
+            response_time=(time.perf_counter() - started) * 1000,
+            response_length=0,
+            exception=exception,
+            context={}
+        )
+    
+    @task
+    def submit_and_follow(self):
+        payload = random_task()
+        task_type = payload["task_type"]
+        started = time.perf_counter()
+        response = self.client.post("/api/tasks", json=payload, name="[Lifecycle] /api/tasks [POST]")
+        if response.status_code not in (200, 201):
+            return
+        submitted = response.json()
+        task_id = submitted["task_id"]
+        suffix = " [memoized]" if submitted.get("memoized") else ""
+        
+        # A memoized execution's queue wait is not this submission's
+        picked_up = bool(suffix)
+        while time.perf_counter() - started < TASK_TIMEOUT:
+            time.sleep(TASK_POLL_INTERVAL)
+            status_response = self.client.get(
+                f"/api/tasks/{task_id}",
+                name="[Lifecycle] /api/tasks/{id} [GET]"
+            )
+            if status_response.status_code != 200:
+                continue
+            state = status_response.json()["status"]
+            if not picked_up and state != "pending":
+                picked_up = True
+                self._report(f"queue wait {task_type}", started)
+            if state in FINISHED_STATES:
+                error = None if state == "success" else Exception(f"Task {task_id} failed")
+                self._report(f"end-to-end {task_type}{suffix}", started, error)
+                return
+        
+        self._report(
+            f"end-to-end {task_type}{suffix}", started,
+            TimeoutError(f"Task {task_id} not finished within {TASK_TIMEOUT:.0f}s")
+        )
+
+
+class StagedLoadShape(LoadTestShape):
+    """
+    Load profile selected with LOAD_SHAPE; inactive when it is unset.
+    
+    ramp:  step up to SHAPE_PEAK_USERS in SHAPE_STEPS equal steps, to find
+           the point where latency or failures take off
+    spike: 20% of peak, a burst at peak for the middle fifth, then back
+    soak:  hold SHAPE_PEAK_USERS for the whole SHAPE_DURATION
+    """
+    
+    abstract = os.getenv("LOAD_SHAPE") is None
+    
+    shape = os.getenv("LOAD_SHAPE", "ramp")
+    peak_users = int(os.getenv("SHAPE_PEAK_USERS", "100"))
+    duration = int(os.getenv("SHAPE_DURATION", "600"))
+    spawn_rate = float(os.getenv("SHAPE_SPAWN_RATE", "10"))
+    steps = int(os.getenv("SHAPE_STEPS", "10"))
+    
+    def tick(self):
+        run_time = self.get_run_time()
+        if run_time >= self.duration:
+            return None
+        
+        if self.shape == "ramp":
+            step_length = self.duration / self.steps
+            step = int(run_time // step_length) + 1
+            return max(1, round(self.peak_users * step / self.steps)), self.spawn_rate
+        
+        if self.shape == "spike":
+            base_users = max(1, self.peak_users // 5)
+            if 0.4 * self.duration <= run_time < 0.6 * self.duration:
+                # Spawn the whole spike within a couple of seconds
+                return self.peak_users, max(self.spawn_rate, self.peak_users / 2)
+            return base_users, self.spawn_rate
+        
+        if self.shape == "soak":
+            return self.peak_users, self.spawn_rate
+        
+        raise ValueError(f"Unknown LOAD_SHAPE: {self.shape} (use ramp, spike or soak)")
@@ -0,0 +1,275 @@
+"""
+Load-test result history and regression comparison.
+
+record   Normalize a Locust CSV run (``--csv`` prefix) or a benchmarks/run.py
+         JSON file into a per-endpoint summary and append it to the history
+         directory (one JSON file per run plus a flat history.csv per branch).
+compare  Compare a run against the most recent runs of a baseline branch and
+         print a compact Markdown report; exits 1 when a regression is found.
+
+    python loadtest/results_history.py record --locust-csv loadtest/results --branch my-feature
+    python loadtest/results_history.py compare --locust-csv loadtest/results --baseline-branch main
+    python loadtest/results_history.py compare --benchmark benchmarks/results/20260101-120000.json
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+LOADTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(LOADTEST_DIR, "history")
+
+PERCENTILES = {"p50_ms": "50%", "p95_ms": "95%", "p99_ms": "99%"}
+HISTORY_FIELDS = [
+    "timestamp", "branch", "commit", "source", "endpoint",
+    "requests", "failures", "failure_rate", "rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+]
+
+
+# Loading runs
+
+def _number(value: str) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def load_locust_csv(prefix: str) -> dict:
+    """Per-endpoint summary from Locust's <prefix>_stats.csv."""
+    endpoints = {}
+    with open(f"{prefix}_stats.csv", newline="") as f:
+        for row in csv.DictReader(f):
+            name = row["Name"] if row["Name"] == "Aggregated" else f"{row['Type']} {row['Name']}"
+            requests = int(row["Request Count"])
+            failures = int(row["Failure Count"])
+            endpoints[name] = {
+                "requests": requests,
+                "failures": failures,
+                "failure_rate": failures / requests if requests else 0.0,
+                "rps": _number(row["Requests/s"]),
+                "mean_ms": _number(row["Average Response Time"]),
+                **{key: _number(row[column]) for key, column in PERCENTILES.items()},
+            }
+    return endpoints
+
+
+def load_benchmark_json(path: str) -> dict:
+    """Per-endpoint summary from a benchmarks/run.py result file."""
+    with open(path) as f:
+        data = json.load(f)
+    endpoints = {}
+    for group in ("routes", "tasks"):
+        for name, metrics in data.get(group, {}).items():
+            requests = metrics["requests"]
+            endpoints[name] = {
+                **{key: metrics[key] for key in ("requests", "failures", "rps", "mean_ms", *PERCENTILES)},
+                "failure_rate": metrics["failures"] / requests if requests else 0.0,
+            }
+    return endpoints
+
+
+def load_run(args) -> dict:
+    if args.locust_csv:
+        return {"source": "locust", "endpoints": load_locust_csv(args.locust_csv)}
+    return {"source": "benchmark", "endpoints": load_benchmark_json(args.benchmark)}
+
+
+def git_value(*cmd: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *cmd], cwd=LOADTEST_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# History
+
+def branch_dir(history: str, branch: str) -> str:
+    return os.path.join(history, branch.replace("/", "-"))
+
+
+def record(run: dict, history: str, branch: str, commit: str) -> str:
+    """Store a run in the history and return the JSON path."""
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run = {
+        "meta": {"timestamp": timestamp, "branch": branch, "commit": commit, "source": run["source"]},
+        "endpoints": run["endpoints"],
+    }
+    directory = branch_dir(history, branch)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{timestamp}-{commit[:8]}.json")
+    with open(path, "w") as f:
+        json.dump(run, f, indent=2, sort_keys=True)
+    
+    csv_path = os.path.join(directory, "history.csv")
+    new_file = not os.path.exists(csv_path)
+    with open(csv_path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS)
+        if new_file:
+            writer.writeheader()
+        for endpoint, metrics in sorted(run["endpoints"].items()):
+            writer.writerow({**run["meta"], "endpoint": endpoint, **metrics})
+    return path
+
+
+def load_baseline_runs(history: str, branch: str, count: int, source: str) -> list:
+    """The most recent runs of a branch from the same source, oldest first."""
+    directory = branch_dir(history, branch)
+    if not os.path.isdir(directory):
+        return []
+    runs = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                run = json.load(f)
+            if run["meta"]["source"] == source:
+                runs.append(run)
+    return runs[-count:]
+
+
+# Comparison
+
+def failure_rate_z(cur_fail: int, cur_total: int, base_fail: int, base_total: int) -> float:
+    """One-sided two-proportion z statistic (positive when current is worse)."""
+    if not cur_total or not base_total:
+        return 0.0
+    pooled = (cur_fail + base_fail) / (cur_total + base_total)
+    if pooled in (0.0, 1.0):
+        return 0.0
+    se = math.sqrt(pooled * (1 - pooled) * (1 / cur_total + 1 / base_total))
+    return (cur_fail / cur_total - base_fail / base_total) / se
+
+
+def compare(current: dict, baseline_runs: list, args) -> list:
+    """
+    Compare per-endpoint metrics with the baseline runs.
+    
+    A latency (throughput) change is a regression when it exceeds the
+    larger of --sigma baseline standard deviations and --rel-threshold of
+    the baseline mean; latency must also move by at least --min-delta-ms.
+    Failure rates use a one-sided two-proportion z-test against the pooled
+    baseline counts.
+    """
+    rows = []
+    for endpoint, cur in sorted(current["endpoints"].items()):
+        samples = [run["endpoints"][endpoint] for run in baseline_runs if endpoint in run["endpoints"]]
+        if not samples or cur["requests"] < args.min_requests:
+            continue
+        checks = []
+        for metric, higher_is_worse in [("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("rps", False)]:
+            values = [s[metric] for s in samples]
+            mean = statistics.fmean(values)
+            stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+            allowed = max(args.sigma * stdev, args.rel_threshold / 100 * mean)
+            delta = cur[metric] - mean
+            if higher_is_worse:
+                allowed = max(allowed, args.min_delta_ms)
+                regressed = delta > allowed
+            else:
+                regressed = -delta > allowed
+            checks.append((metric, mean, cur[metric], regressed))
+        
+        base_fail = sum(s["failures"] for s in samples)
+        base_total = sum(s["requests"] for s in samples)
+        z = failure_rate_z(cur["failures"], cur["requests"], base_fail, base_total)
+        base_rate = base_fail / base_total if base_total else 0.0
+        fail_regressed = z > args.z_threshold and cur["failure_rate"] - base_rate > args.min_failure_delta
+        checks.append(("failure_rate", base_rate, cur["failure_rate"], fail_regressed))
+        rows.append((endpoint, checks))
+    return rows
+
+
+def format_delta(metric: str, base: float, cur: float) -> str:
+    if metric == "failure_rate":
+        return f"{base * 100:.2f}% → {cur * 100:.2f}%"
+    pct = (cur - base) / base * 100 if base else 0.0
+    unit = "" if metric == "rps" else " ms"
+    return f"{base:.1f} → {cur:.1f}{unit} ({pct:+.0f}%)"
+
+
+def render_report(rows: list, baseline_count: int, args) -> str:
+    regressions = [(e, c) for e, checks in rows for c in checks if c[3]]
+    verdict = "FAIL" if regressions else "PASS"
+    lines = [
+        f"### Load test comparison: {verdict}",
+        "",
+        f"Baseline: last {baseline_count} run(s) of `{args.baseline_branch}`, "
+        f"thresholds: {args.sigma:g}σ / {args.rel_threshold:g}% / z>{args.z_threshold:g}",
+        "",
+        "| Endpoint | p50 | p95 | p99 | RPS | Failures |",
+        "|----------|-----|-----|-----|-----|----------|",
+    ]
+    for endpoint, checks in rows:
+        cells = [("**" if reg else "") + format_delta(m, b, c) + (" ❌**" if reg else "")
+                 for m, b, c, reg in checks]
+        lines.append(f"| {endpoint} | " + " | ".join(cells) + " |")
+    if regressions:
+        lines += ["", f"{len(regressions)} regression(s):"]
+        lines += [f"- {e}: {format_delta(m, b, c)} ({m})" for e, (m, b, c, _) in regressions]
+    return "\n".join(lines) + "\n"
+
+
+# CLI
+
+def add_source_args(parser):
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--locust-csv", help="Locust --csv prefix, e.g. loadtest/results")
+    source.add_argument("--benchmark", help="benchmarks/run.py result JSON")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    rec = sub.add_parser("record", help="Append a run to the history")
+    add_source_args(rec)
+    rec.add_argument("--branch", default=None, help="Defaults to the current git branch")
+    rec.add_argument("--commit", default=None, help="Defaults to the current git commit")
+    
+    cmp_ = sub.add_parser("compare", help="Compare a run with the baseline branch")
+    add_source_args(cmp_)
+    cmp_.add_argument("--baseline-branch", default="main")
+    cmp_.add_argument("--baseline-runs", type=int, default=5)
+    cmp_.add_argument("--sigma", type=float, default=3.0)
+    cmp_.add_argument("--rel-threshold", type=float, default=15.0, help="Percent")
+    cmp_.add_argument("--min-delta-ms", type=float, default=5.0)
+    cmp_.add_argument("--z-threshold", type=float, default=2.33, help="One-sided, 2.33 = 99%%")
+    cmp_.add_argument("--min-failure-delta", type=float, default=0.005)
+    cmp_.add_argument("--min-requests", type=int, default=50)
+    cmp_.add_argument("--report", help="Also write the Markdown report to this file")
+    args = parser.parse_args()
+    
+    run = load_run(args)
+    
+    if args.command == "record":
+        branch = args.branch or git_value("rev-parse", "--abbrev-ref", "HEAD")
+        commit = args.commit or git_value("rev-parse", "HEAD")
+        print(f"Recorded {record(run, args.history, branch, commit)}")
+        return 0
+    
+    baseline_runs = load_baseline_runs(args.history, args.baseline_branch, args.baseline_runs, run["source"])
+    if not baseline_runs:
+        report = f"### Load test comparison: SKIPPED\n\nNo `{run['source']}` runs recorded for `{args.baseline_branch}`.\n"
+        failed = False
+    else:
+        rows = compare(run, baseline_runs, args)
+        report = render_report(rows, len(baseline_runs), args)
+        failed = any(check[3] for _, checks in rows for check in checks)
+    
+    print(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(report)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Summarize a span file written by the backend tracer (TRACING_ENABLED=true).
+
+Prints, per Celery task type, how long tasks waited in the queue versus how
+long they executed, and per HTTP route the latency together with the time
+spent in MongoDB and Redis calls made while serving it.
+
+    python loadtest/trace_summary.py traces.jsonl
+    python loadtest/trace_summary.py traces.jsonl --output trace_summary.json
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def load_spans(path: str) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_tasks(spans: list) -> dict:
+    queue_wait = defaultdict(list)
+    execution = defaultdict(list)
+    failures = defaultdict(int)
+    for span in spans:
+        if span["kind"] != "consumer" or not span["name"].startswith("celery.execute "):
+            continue
+        name = span["attributes"]["celery.task_name"]
+        execution[name].append(span["duration_ms"])
+        if "celery.queue_wait_ms" in span["attributes"]:
+            queue_wait[name].append(span["attributes"]["celery.queue_wait_ms"])
+        if span["error"]:
+            failures[name] += 1
+    return {
+        name: {
+            "tasks": len(execution[name]),
+            "failures": failures[name],
+            "queue_wait_p50_ms": round(percentile(queue_wait[name], 50), 1),
+            "queue_wait_p95_ms": round(percentile(queue_wait[name], 95), 1),
+            "execute_p50_ms": round(percentile(execution[name], 50), 1),
+            "execute_p95_ms": round(percentile(execution[name], 95), 1),
+        }
+        for name in sorted(execution)
+    }
+
+
+def summarize_routes(spans: list) -> dict:
+    by_id = {span["span_id"]: span for span in spans}
+    latency = defaultdict(list)
+    io_ms = defaultdict(lambda: defaultdict(float))
+    for span in spans:
+        if span["kind"] == "server":
+            latency[span["name"]].append(span["duration_ms"])
+    for span in spans:
+        system = span["attributes"].get("db.system")
+        if span["kind"] != "client" or not system:
+            continue
+        # Attribute the call to the server span it ran under
+        parent = by_id.get(span["parent_id"])
+        while parent is not None and parent["kind"] != "server":
+            parent = by_id.get(parent["parent_id"])
+        if parent is not None:
+            io_ms[parent["name"]][system] += span["duration_ms"]
+    return {
+        name: {
+            "requests": len(values),
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "mongodb_ms_per_request": round(io_ms[name]["mongodb"] / len(values), 2),
+            "redis_ms_per_request": round(io_ms[name]["redis"] / len(values), 2),
+        }
+        for name, values in sorted(latency.items())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("spans", help="Span file (TRACE_EXPORT_PATH)")
+    parser.add_argument("--output", help="Write the summary as JSON to this file")
+    args = parser.parse_args()
+    
+    spans = load_spans(args.spans)
+    tasks = summarize_tasks(spans)
+    routes = summarize_routes(spans)
+    
+    print(f"{'task':<28} {'n':>6} {'wait p50':>9} {'wait p95':>9} {'exec p50':>9} {'exec p95':>9} {'fail':>5}")
+    for name, t in tasks.items():
+        print(f"{name:<28} {t['tasks']:>6} {t['queue_wait_p50_ms']:>9.1f} {t['queue_wait_p95_ms']:>9.1f} "
+              f"{t['execute_p50_ms']:>9.1f} {t['execute_p95_ms']:>9.1f} {t['failures']:>5}")
+    print(f"\n{'route':<32} {'n':>6} {'p50 ms':>8} {'p95 ms':>8} {'mongo ms':>9} {'redis ms':>9}")
+    for name, r in routes.items():
+        print(f"{name:<32} {r['requests']:>6} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+              f"{r['mongodb_ms_per_request']:>9.2f} {r['redis_ms_per_request']:>9.2f}")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"tasks": tasks, "routes": routes}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())